@@ -1,8 +1,8 @@
 import streamlit as st
 import time
-import random
 import json
 import os
+import logging
 from PIL import Image
 from streamlit_option_menu import option_menu
 from streamlit_autorefresh import st_autorefresh
@@ -17,6 +17,13 @@ from poker.player import Player
 from poker.game import PokerGame, GameState, GameAction
 from poker.ai import AIPlayer
 
+# Show the game engine's event log on the console
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Pause (seconds) before showing an AI move so it reads like the AI is thinking.
+# The game engine itself never sleeps; set to 0 to disable the pause.
+AI_MOVE_DELAY = 0.3
+
 # App configuration
 st.set_page_config(
     page_title="Interactive Poker Game",
@@ -610,7 +617,8 @@ if selected == "Play":
         if game.current_player and game.current_player != game.human_player and not game.is_hand_complete():
             with st.spinner(f"{game.current_player.name} is thinking..."):
                 # Small delay to make AI seem more realistic
-                time.sleep(0.3)
+                if AI_MOVE_DELAY:
+                    time.sleep(AI_MOVE_DELAY)
                 
                 try:
                     # Get AI action
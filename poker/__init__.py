@@ -4,18 +4,19 @@ Interactive Texas Hold'em Poker Game - Core Logic
 """
 
 # Import only what exists in cards.py
-from .cards import Card, Deck, Hand, evaluate_hand, rank_to_string
+from .cards import (Card, Deck, Hand, BoardContext, evaluate_hand, evaluate_ids,
+                    score_hand, score_ids, rank_to_string)
+from .batch_eval import evaluate_batch, compare_hands_batch
+from .equity import estimate_equity, estimate_hand_equity, shutdown_pools
 from .player import Player
 from .game import PokerGame, GameState, GameAction
 from .ai import AIPlayer
 
 __all__ = [
-    'Card', 'Deck', 'Hand', 'evaluate_hand', 'rank_to_string',
+    'Card', 'Deck', 'Hand', 'BoardContext', 'evaluate_hand', 'evaluate_ids',
+    'score_hand', 'score_ids', 'rank_to_string',
+    'evaluate_batch', 'compare_hands_batch', 'estimate_equity',
+    'estimate_hand_equity', 'shutdown_pools',
     'Player', 'AIPlayer',
     'PokerGame', 'GameState', 'GameAction'
 ]
-
-from .cards import Card, Deck, Hand, evaluate_hand, rank_to_string
-from .player import Player
-from .ai import AIPlayer
-from .game import PokerGame, GameState, GameAction
\ No newline at end of file
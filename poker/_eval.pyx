@@ -0,0 +1,144 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+# distutils: extra_compile_args = -O3
+"""
+Compiled hand evaluator
+=======================
+
+Optional C implementation of the hand scoring used by ``cards.evaluate_ids``.
+Build it in place with ``cythonize -i poker/_eval.pyx``; when the extension is
+not available the pure Python evaluator is used instead.
+
+Scores are packed into a single integer: the hand category (0-9) in bits
+20 and up, followed by up to five 4-bit tie-breaker ranks from bit 16 down.
+"""
+
+from libc.stdint cimport int64_t
+
+
+# Rank mask of every straight from Ace-high down to the A-5 wheel (Ace counts as 1)
+cdef int _STRAIGHT_MASKS[10]
+_STRAIGHT_MASKS[:] = [0x1F00, 0xF80, 0x7C0, 0x3E0, 0x1F0, 0xF8, 0x7C, 0x3E, 0x1F, 0x100F]
+
+
+cdef inline int _straight_high(int mask) noexcept nogil:
+    """Highest card of the best straight in a 13-bit rank mask, or -1"""
+    cdef int i
+    for i in range(10):
+        if mask & _STRAIGHT_MASKS[i] == _STRAIGHT_MASKS[i]:
+            return 12 - i  # the wheel (i = 9) is 5-high, rank value 3
+    return -1
+
+
+cdef inline int64_t _pack_top(int mask, int count, int shift) noexcept nogil:
+    """Pack the `count` highest ranks of a rank mask, starting at bit `shift`"""
+    cdef int64_t packed = 0
+    cdef int rank = 12
+    while count > 0 and rank >= 0:
+        if mask & (1 << rank):
+            packed |= (<int64_t>rank) << shift
+            shift -= 4
+            count -= 1
+        rank -= 1
+    return packed
+
+
+cdef int64_t evaluate_hand_c(const char* ranks, const char* suits, int n) noexcept nogil:
+    """Score up to seven cards given as parallel rank (0-12) and suit (0-3) arrays"""
+    cdef int counts[13]
+    cdef int suit_counts[4]
+    cdef int suit_masks[4]
+    cdef int rank_mask = 0
+    cdef int flush_suit = -1
+    cdef int four = -1, three = -1, pair = -1, second_pair = -1
+    cdef int i, r, s, high
+
+    for i in range(13):
+        counts[i] = 0
+    for i in range(4):
+        suit_counts[i] = 0
+        suit_masks[i] = 0
+
+    for i in range(n):
+        r = ranks[i]
+        s = suits[i]
+        counts[r] += 1
+        suit_counts[s] += 1
+        suit_masks[s] |= 1 << r
+        rank_mask |= 1 << r
+
+    for s in range(4):
+        if suit_counts[s] >= 5:
+            flush_suit = s
+
+    # Straight flush / royal flush, using only the cards of the flush suit
+    if flush_suit >= 0:
+        high = _straight_high(suit_masks[flush_suit])
+        if high == 12:
+            return (<int64_t>9) << 20
+        if high >= 0:
+            return ((<int64_t>8) << 20) | (high << 16)
+
+    # Classify ranks by count, highest first. A second set of trips plays as the pair.
+    for r in range(12, -1, -1):
+        if counts[r] == 4:
+            if four < 0:
+                four = r
+        elif counts[r] == 3:
+            if three < 0:
+                three = r
+            elif pair < 0:
+                pair = r
+        elif counts[r] == 2:
+            if pair < 0:
+                pair = r
+            elif second_pair < 0:
+                second_pair = r
+
+    if four >= 0:
+        return ((<int64_t>7) << 20) | (four << 16) | _pack_top(rank_mask & ~(1 << four), 1, 12)
+
+    if three >= 0 and pair >= 0:
+        return ((<int64_t>6) << 20) | (three << 16) | (pair << 12)
+
+    if flush_suit >= 0:
+        return ((<int64_t>5) << 20) | _pack_top(suit_masks[flush_suit], 5, 16)
+
+    high = _straight_high(rank_mask)
+    if high >= 0:
+        return ((<int64_t>4) << 20) | (high << 16)
+
+    if three >= 0:
+        return ((<int64_t>3) << 20) | (three << 16) | _pack_top(rank_mask & ~(1 << three), 2, 12)
+
+    if second_pair >= 0:
+        return (((<int64_t>2) << 20) | (pair << 16) | (second_pair << 12)
+                | _pack_top(rank_mask & ~((1 << pair) | (1 << second_pair)), 1, 8))
+
+    if pair >= 0:
+        return ((<int64_t>1) << 20) | (pair << 16) | _pack_top(rank_mask & ~(1 << pair), 3, 12)
+
+    return _pack_top(rank_mask, 5, 16)
+
+
+cpdef long long evaluate_ids(object card_ids) except? -1:
+    """Return the packed score of at most seven card ids (Card.id, 0-51)"""
+    cdef char ranks[7]
+    cdef char suits[7]
+    cdef int n = len(card_ids)
+    cdef int i, card_id
+    cdef int64_t score
+
+    if n > 7:
+        raise ValueError(f"Cannot evaluate more than 7 cards, got {n}")
+
+    for i in range(n):
+        card_id = card_ids[i]
+        # Bounds checks are off, so reject ids that would index past the rank and suit tables
+        if card_id < 0 or card_id > 51:
+            raise ValueError(f"Card ids must be between 0 and 51, got {card_id}")
+        ranks[i] = card_id % 13
+        suits[i] = card_id // 13
+
+    with nogil:
+        score = evaluate_hand_c(ranks, suits, n)
+    return score
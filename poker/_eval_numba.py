@@ -0,0 +1,162 @@
+"""
+Numba-compiled hand evaluator
+=============================
+
+Optional JIT implementation of the hand scoring used by ``cards.evaluate_ids``,
+used when the Cython extension is not built but Numba is installed. Functions
+are compiled eagerly for fixed signatures with ``cache=True``, so the machine
+code is written next to the module once and later processes load it instead
+of paying the compile cost on the first hand. The entry points release the
+GIL, so threads scoring hands at the same time run in parallel.
+
+Scores use the same packing as ``_eval.pyx``: the hand category in bits 20 and
+up, followed by up to five 4-bit tie-breaker ranks from bit 16 down.
+"""
+
+import numpy as np
+from numba import njit
+
+# Lowest bit of each of the 13 rank nibbles
+_NIBBLE_LOW_BITS = 0x1111111111111
+
+
+# Rank mask of every straight from Ace-high down to the A-5 wheel (Ace counts as 1)
+_STRAIGHT_MASKS = np.array([0x1F00, 0xF80, 0x7C0, 0x3E0, 0x1F0, 0xF8, 0x7C, 0x3E, 0x1F, 0x100F],
+                           dtype=np.int64)
+
+
+@njit('int64(int64)', cache=True)
+def _straight_high(mask):
+    """Highest card of the best straight in a 13-bit rank mask, or -1"""
+    for i in range(10):
+        if mask & _STRAIGHT_MASKS[i] == _STRAIGHT_MASKS[i]:
+            return 12 - i  # the wheel (i = 9) is 5-high, rank value 3
+    return -1
+
+
+@njit('int64(int64, int64, int64)', cache=True)
+def _pack_top(mask, count, shift):
+    """Pack the `count` highest ranks of a rank mask, starting at bit `shift`"""
+    packed = 0
+    rank = 12
+    while count > 0 and rank >= 0:
+        if mask & (1 << rank):
+            packed |= rank << shift
+            shift -= 4
+            count -= 1
+        rank -= 1
+    return packed
+
+
+@njit('int64(int64)', cache=True)
+def _high_bit(mask):
+    """Index of the highest set bit of a non-negative mask, or -1"""
+    high = -1
+    while mask:
+        mask >>= 1
+        high += 1
+    return high
+
+
+@njit('int64(int64)', cache=True)
+def _nibbles_to_mask(nibble_mask):
+    """Convert a one-bit-per-nibble mask to a 13-bit rank mask"""
+    mask = 0
+    for rank in range(13):
+        mask |= ((nibble_mask >> (4 * rank)) & 1) << rank
+    return mask
+
+
+@njit('int64(uint8[:])', cache=True, nogil=True, boundscheck=False)
+def evaluate(card_ids):
+    """Score cards given as an array of card ids (0-51) using only scalar integers"""
+    # 13-bit rank mask per suit in four 16-bit fields, a 4-bit count per rank and per suit
+    suit_masks = 0
+    rank_nibbles = 0
+    suit_counts = 0
+    for i in range(card_ids.shape[0]):
+        card_id = np.int64(card_ids[i])
+        suit = card_id // 13
+        rank = card_id % 13
+        suit_masks |= 1 << (16 * suit + rank)
+        rank_nibbles += 1 << (4 * rank)
+        suit_counts += 1 << (4 * suit)
+
+    # OR the four suit fields together
+    rank_mask = suit_masks | (suit_masks >> 32)
+    rank_mask = (rank_mask | (rank_mask >> 16)) & 0x1FFF
+
+    # Adding 3 to every suit count carries into its top bit exactly when the count is 5 or more
+    # (seven cards at most, so no nibble overflows); at most one suit can hold a flush
+    flush_bits = (suit_counts + 0x3333) & 0x8888
+    flush_mask = 0
+    if flush_bits:
+        flush_mask = (suit_masks >> (4 * _high_bit(flush_bits >> 3))) & 0x1FFF
+
+    # Straight flush / royal flush, using only the cards of the flush suit
+    if flush_mask:
+        high = _straight_high(flush_mask)
+        if high == 12:
+            return 9 << 20
+        if high >= 0:
+            return (8 << 20) | (high << 16)
+
+    # Ranks held four, three and two times, as 13-bit rank masks
+    quads = _nibbles_to_mask((rank_nibbles >> 2) & _NIBBLE_LOW_BITS)
+    trips = _nibbles_to_mask((rank_nibbles >> 1) & rank_nibbles & _NIBBLE_LOW_BITS)
+    pairs = _nibbles_to_mask((rank_nibbles >> 1) & ~rank_nibbles & _NIBBLE_LOW_BITS)
+
+    if quads:
+        four = _high_bit(quads)
+        return (7 << 20) | (four << 16) | _pack_top(rank_mask & ~(1 << four), 1, 12)
+
+    # A second set of trips can play as the pair of a full house
+    three = _high_bit(trips)
+    if three >= 0:
+        full_pair = _high_bit((trips & ~(1 << three)) | pairs)
+        if full_pair >= 0:
+            return (6 << 20) | (three << 16) | (full_pair << 12)
+
+    if flush_mask:
+        return (5 << 20) | _pack_top(flush_mask, 5, 16)
+
+    high = _straight_high(rank_mask)
+    if high >= 0:
+        return (4 << 20) | (high << 16)
+
+    if three >= 0:
+        return (3 << 20) | (three << 16) | _pack_top(rank_mask & ~(1 << three), 2, 12)
+
+    pair = _high_bit(pairs)
+    if pair >= 0:
+        second_pair = _high_bit(pairs & ~(1 << pair))
+        if second_pair >= 0:
+            return ((2 << 20) | (pair << 16) | (second_pair << 12)
+                    | _pack_top(rank_mask & ~((1 << pair) | (1 << second_pair)), 1, 8))
+        return (1 << 20) | (pair << 16) | _pack_top(rank_mask & ~(1 << pair), 3, 12)
+
+    return _pack_top(rank_mask, 5, 16)
+
+
+@njit('int64[:](uint8[:, :], uint8[:])', cache=True, nogil=True, boundscheck=False)
+def evaluate_showdown(hole_ids, board_ids):
+    """Score each row of hole card ids together with the shared board card ids"""
+    scores = np.empty(hole_ids.shape[0], dtype=np.int64)
+    # One buffer holds the board after the hole cards, which are swapped in for each player
+    cards = np.empty(hole_ids.shape[1] + board_ids.shape[0], dtype=np.uint8)
+    cards[hole_ids.shape[1]:] = board_ids
+    for i in range(hole_ids.shape[0]):
+        cards[:hole_ids.shape[1]] = hole_ids[i]
+        scores[i] = evaluate(cards)
+    return scores
+
+
+def score_showdown(hole_ids, board_ids):
+    """Packed scores of several hands of hole card ids against one board of card ids"""
+    return evaluate_showdown(np.asarray(hole_ids, dtype=np.uint8).reshape(len(hole_ids), -1),
+                             np.asarray(board_ids, dtype=np.uint8)).tolist()
+
+
+def evaluate_ids(card_ids):
+    """Return the packed score of a sequence of card ids (Card.id, 0-51)"""
+    return int(evaluate(np.asarray(card_ids, dtype=np.uint8)))
@@ -1,40 +1,106 @@
-import random
+from functools import lru_cache
+from itertools import permutations
+
+import numpy as np
 from .player import Player
 from .cards import evaluate_hand
+from .equity import estimate_hand_equity
+
+def _preflop_heuristic(high, low, suited):
+    """Strength (0 to 1) of two hole cards given their rank values"""
+    # Pocket pairs - higher pairs are stronger
+    if high == low:
+        return 0.5 + (high / 25.0)
+    
+    # Connected cards (straight potential)
+    if high - low <= 1:
+        return 0.3 + (high / 40.0)
+    
+    # Suited cards (flush potential)
+    if suited:
+        return 0.25 + (high / 50.0)
+    
+    # High cards - 10, J, Q, K, A
+    if high >= 10:
+        return 0.2 + ((high - 10) / 25.0)
+    
+    # Low, unconnected, unsuited cards
+    return 0.1
+
+# Strength of the 169 distinct starting hands, keyed by (high rank, low rank, suited)
+PREFLOP_STRENGTH = {
+    (high, low, suited): _preflop_heuristic(high, low, suited)
+    for high in range(13)
+    for low in range(high + 1)
+    for suited in (False, True)
+    if not (suited and high == low)
+}
+
+# Every relabelling of the four suits, which leaves the equity of a hand unchanged
+_SUIT_PERMUTATIONS = tuple(permutations(range(4)))
+
+def _canonical_cards(hole_ids, board_ids):
+    """Smallest sorted (hole, board) card ids over all relabellings of the suits"""
+    return min((tuple(sorted(perm[card_id // 13] * 13 + card_id % 13 for card_id in hole_ids)),
+                tuple(sorted(perm[card_id // 13] * 13 + card_id % 13 for card_id in board_ids)))
+               for perm in _SUIT_PERMUTATIONS)
+
+@lru_cache(maxsize=1 << 16)
+def _cached_hand_equity(hole_ids, board_ids, opponents, trials, workers):
+    """Equity of canonical cards, seeded from the cards so the same spot always gets the same estimate"""
+    # Shared by every AI player, so this deliberately ignores the player's own generator: all AIs get the
+    # same estimate in the same spot, and their rng only drives their noise, bluffs and raise sizing
+    seed = [*hole_ids, *board_ids, opponents, trials]
+    return estimate_hand_equity(hole_ids, board_ids, opponents, trials, seed=seed, workers=workers)
+
+# (low, high) bounds of the random aggression and bluff factor for each difficulty.
+# Unknown difficulties play like Expert.
+AGGRESSION_RANGES = {
+    "Easy": (0.1, 0.3),
+    "Medium": (0.3, 0.6),
+    "Hard": (0.6, 0.8),
+    "Expert": (0.7, 0.9)
+}
+
+BLUFF_RANGES = {
+    "Easy": (0.05, 0.15),
+    "Medium": (0.15, 0.25),
+    "Hard": (0.25, 0.40),
+    "Expert": (0.30, 0.50)
+}
 
 class AIPlayer(Player):
     """AI Poker Player"""
     
-    def __init__(self, name, chips=1000, difficulty="Medium"):
+    __slots__ = ('difficulty', 'equity_trials', 'equity_workers', '_rng', 'aggression', 'bluff_factor')
+    
+    def __init__(self, name, chips=1000, difficulty="Medium", rng=None, equity_trials=0, equity_workers=1):
         super().__init__(name, chips)
         self.difficulty = difficulty
+        # Monte Carlo trials behind post-flop hand strength; 0 keeps the hand-rank estimate
+        self.equity_trials = equity_trials
+        # Processes the trials are shared out over (1 runs them in this process)
+        self.equity_workers = equity_workers
+        # Each AI draws from its own generator (pass a seeded one for reproducible games)
+        self._rng = rng if rng is not None else np.random.default_rng()
         self.aggression = self._set_aggression()
         self.bluff_factor = self._set_bluff_factor()
     
     def _set_aggression(self):
         """Set aggression level based on difficulty"""
-        if self.difficulty == "Easy":
-            return random.uniform(0.1, 0.3)
-        elif self.difficulty == "Medium":
-            return random.uniform(0.3, 0.6)
-        elif self.difficulty == "Hard":
-            return random.uniform(0.6, 0.8)
-        else:  # Expert
-            return random.uniform(0.7, 0.9)
+        low, high = AGGRESSION_RANGES.get(self.difficulty, AGGRESSION_RANGES["Expert"])
+        return self._rng.uniform(low, high)
     
     def _set_bluff_factor(self):
         """Set bluff factor based on difficulty"""
-        if self.difficulty == "Easy":
-            return random.uniform(0.05, 0.15)
-        elif self.difficulty == "Medium":
-            return random.uniform(0.15, 0.25)
-        elif self.difficulty == "Hard":
-            return random.uniform(0.25, 0.40)
-        else:  # Expert
-            return random.uniform(0.30, 0.50)
+        low, high = BLUFF_RANGES.get(self.difficulty, BLUFF_RANGES["Expert"])
+        return self._rng.uniform(low, high)
     
     def decide_action(self, game_state):
         """Decide AI action based on game state and difficulty"""
+        # Draw all the randomness needed for this decision in one call
+        noise = self._rng.random(7)
+        
         # Extract relevant information from game state
         pot = game_state.get('pot', 0)
         current_bet = game_state.get('current_bet', 0)
@@ -47,7 +113,8 @@ class AIPlayer(Player):
         pot_odds = to_call / (pot + to_call) if to_call > 0 else 0
         
         # Evaluate hand strength (0 to 1)
-        hand_strength = self._evaluate_hand_strength(community_cards)
+        opponents = max(1, game_state.get('active_players', 2) - 1)
+        hand_strength = self._evaluate_hand_strength(community_cards, opponents)
         
         # Position advantage (being dealer or close to dealer is advantageous)
         position_factor = game_state.get('position_advantage', 0.0)
@@ -73,18 +140,18 @@ class AIPlayer(Player):
         
         # Apply difficulty-based randomness
         randomness = 0.5 - self.difficulty_level * 0.1  # Lower difficulty = more randomness
-        ev_call *= random.uniform(1 - randomness, 1 + randomness)
-        ev_raise *= random.uniform(1 - randomness, 1 + randomness)
-        ev_check *= random.uniform(1 - randomness, 1 + randomness)
+        ev_call *= 1 + randomness * (2 * noise[0] - 1)
+        ev_raise *= 1 + randomness * (2 * noise[1] - 1)
+        ev_check *= 1 + randomness * (2 * noise[2] - 1)
         
         # Decision logic
         if to_call == 0:  # Can check
             # Sometimes bluff
-            if random.random() < self.bluff_factor and hand_strength < 0.3:
-                raise_amount = int(min(self.chips, pot * random.uniform(0.1, 0.3)))
+            if noise[3] < self.bluff_factor and hand_strength < 0.3:
+                raise_amount = int(min(self.chips, pot * (0.1 + 0.2 * noise[4])))
                 return "raise", max(10, raise_amount)
                 
-            if ev_raise > ev_check and random.random() < self.aggression:
+            if ev_raise > ev_check and noise[5] < self.aggression:
                 # Raise proportional to hand strength and pot
                 raise_factor = hand_strength * (0.5 + self.aggression * 0.5)
                 raise_amount = int(min(self.chips, pot * raise_factor))
@@ -97,7 +164,7 @@ class AIPlayer(Player):
             
             # Go all-in with very strong hands or as a calculated risk
             if (hand_strength > all_in_threshold and self.chips <= to_call * 3) or \
-               (hand_strength > 0.92 and random.random() < self.aggression * 1.5):
+               (hand_strength > 0.92 and noise[6] < self.aggression * 1.5):
                 return "all_in", 0
             
             # Determine best action based on EV
@@ -223,38 +290,26 @@ class AIPlayer(Player):
             "Expert": 1.0
         }.get(self.difficulty, 0.5)
     
-    def _evaluate_hand_strength(self, community_cards):
+    def _evaluate_hand_strength(self, community_cards, opponents=1):
         """Evaluate the strength of the current hand (0 to 1)"""
-        # If no community cards, evaluate based on hole cards
+        # If no community cards, look up the precomputed hole card strength
         if not community_cards:
-            # Evaluate pocket pairs
-            if len(self.hand) == 2 and self.hand[0].rank == self.hand[1].rank:
-                rank_value = self.hand[0].rank_value
-                # Higher pairs are stronger
-                return 0.5 + (rank_value / 25.0)
-                
-            # Evaluate connected cards (straight potential)
-            elif len(self.hand) == 2:
-                rank_diff = abs(self.hand[0].rank_value - self.hand[1].rank_value)
-                if rank_diff <= 1:  # Connected
-                    high_card = max(self.hand[0].rank_value, self.hand[1].rank_value)
-                    return 0.3 + (high_card / 40.0)
-                    
-                # Evaluate suited cards (flush potential)
-                if self.hand[0].suit == self.hand[1].suit:
-                    high_card = max(self.hand[0].rank_value, self.hand[1].rank_value)
-                    return 0.25 + (high_card / 50.0)
-                
-                # High cards
-                high_card = max(self.hand[0].rank_value, self.hand[1].rank_value)
-                if high_card >= 10:  # 10, J, Q, K, A
-                    return 0.2 + ((high_card - 10) / 25.0)
-            
-            # Low, unconnected, unsuited cards
-            return 0.1
+            if len(self.hand) != 2:
+                return 0.1
+            first, second = self.hand
+            high = max(first.rank_value, second.rank_value)
+            low = min(first.rank_value, second.rank_value)
+            return PREFLOP_STRENGTH[high, low, first.suit == second.suit]
+        
+        # Optionally simulate the rest of the board against random hands for the opponents still in
+        if self.equity_trials and len(self.hand) == 2:
+            # Spots that differ only by suit labels share one cached estimate
+            hole_ids, board_ids = _canonical_cards([card.id for card in self.hand],
+                                                   [card.id for card in community_cards])
+            return _cached_hand_equity(hole_ids, board_ids, opponents, self.equity_trials, self.equity_workers)
         
         # With community cards, do a proper evaluation
-        all_cards = self.hand + community_cards
+        all_cards = [*self.hand, *community_cards]
         
         # Get the numerical rank value (0-9)
         hand_value = evaluate_hand(all_cards)
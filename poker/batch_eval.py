@@ -0,0 +1,132 @@
+"""
+Batched hand evaluator
+======================
+
+NumPy version of the bitmask evaluator in ``cards.py`` for scoring many hands
+in one call, e.g. every candidate hole-card pair against a fixed board in a
+Monte Carlo equity estimate. Each step works on whole columns of hands, so the
+per-hand cost is a handful of array operations instead of a Python loop.
+
+Scores use the same packing as ``_eval.pyx``: the hand category in bits 20 and
+up, followed by up to five 4-bit tie-breaker ranks from bit 16 down. Higher
+scores are better hands, so they can be compared and reduced directly.
+"""
+
+import numpy as np
+
+# Number of set bits in every 13-bit rank mask
+_POPCOUNT = np.array([bin(mask).count('1') for mask in range(1 << 13)], dtype=np.int64)
+
+# Highest set bit of every 14-bit mask, -1 for an empty mask
+_HIGH_BIT = np.array([mask.bit_length() - 1 for mask in range(1 << 14)], dtype=np.int64)
+
+def _top5(mask):
+    """Up to five highest ranks of a 13-bit mask, packed from bit 16 down"""
+    packed, shift = 0, 16
+    for rank in range(12, -1, -1):
+        if mask >> rank & 1 and shift >= 0:
+            packed |= rank << shift
+            shift -= 4
+    return packed
+
+# Five highest ranks of every 13-bit rank mask, packed as the kickers of a score
+_TOP5 = np.array([_top5(mask) for mask in range(1 << 13)], dtype=np.int64)
+
+# Lowest bit of each of the 13 rank nibbles
+_NIBBLE_LOW_BITS = 0x1111111111111
+
+def _pack_top(mask, count, shift):
+    """Pack the `count` highest ranks of each rank mask, starting at bit `shift`"""
+    return (_TOP5[mask] >> (4 * (5 - count))) << (shift - 4 * (count - 1))
+
+def _straight_high(mask):
+    """Highest card of the best straight in each rank mask, or -1"""
+    # Shift up one place and copy the Ace into bit 0 so A-2-3-4-5 is found too
+    mask = (mask << 1) | (mask >> 12)
+    runs = mask & (mask >> 1) & (mask >> 2) & (mask >> 3) & (mask >> 4)
+    return np.where(runs > 0, _HIGH_BIT[runs] + 3, -1)
+
+def _nibbles_to_mask(nibble_mask):
+    """Convert one-bit-per-nibble masks to 13-bit rank masks"""
+    mask = np.zeros_like(nibble_mask)
+    for rank in range(13):
+        mask |= ((nibble_mask >> (4 * rank)) & 1) << rank
+    return mask
+
+def evaluate_batch(card_ids):
+    """
+    Score an (N, k) array of card ids (Card.id, 0-51), one hand of k >= 5
+    cards per row. Returns an (N,) int64 array of packed scores.
+    """
+    card_ids = np.asarray(card_ids, dtype=np.int64)
+    if card_ids.ndim != 2 or card_ids.shape[1] < 5:
+        raise ValueError(f"Expected an (N, k) array of card ids with k >= 5, got shape {card_ids.shape}")
+
+    ranks = card_ids % 13
+    suits = card_ids // 13
+    rank_bits = np.int64(1) << ranks
+
+    # 13-bit rank mask per suit and a 4-bit count per rank, for every hand
+    suit_masks = np.stack([np.bitwise_or.reduce(np.where(suits == suit, rank_bits, 0), axis=1)
+                           for suit in range(4)], axis=1)
+    rank_nibbles = (np.int64(1) << (4 * ranks)).sum(axis=1)
+    rank_mask = np.bitwise_or.reduce(suit_masks, axis=1)
+
+    # Flush: the suit holding five or more cards (at most one with seven cards)
+    suit_counts = _POPCOUNT[suit_masks]
+    flush_suit = suit_counts.argmax(axis=1)
+    is_flush = suit_counts.max(axis=1) >= 5
+    flush_mask = np.where(is_flush, suit_masks[np.arange(len(suit_masks)), flush_suit], 0)
+    flush_straight = np.where(is_flush, _straight_high(flush_mask), -1)
+
+    # Ranks held four, three and two times, as 13-bit rank masks
+    quads = _nibbles_to_mask((rank_nibbles >> 2) & _NIBBLE_LOW_BITS)
+    trips = _nibbles_to_mask((rank_nibbles >> 1) & rank_nibbles & _NIBBLE_LOW_BITS)
+    pairs = _nibbles_to_mask((rank_nibbles >> 1) & ~rank_nibbles & _NIBBLE_LOW_BITS)
+
+    # Top ranks of each group, clamped to 0 where the group is empty
+    four = np.maximum(_HIGH_BIT[quads], 0)
+    three = np.maximum(_HIGH_BIT[trips], 0)
+    # A second set of trips can play as the pair of a full house
+    full_pair = _HIGH_BIT[(trips & ~(1 << three)) | pairs]
+    pair = np.maximum(_HIGH_BIT[pairs], 0)
+    second_pair = np.maximum(_HIGH_BIT[pairs & ~(1 << pair)], 0)
+    straight = _straight_high(rank_mask)
+
+    # Conditions and scores from the best category down; np.select takes the first match
+    conditions = [
+        flush_straight == 12,
+        flush_straight >= 0,
+        quads > 0,
+        (trips > 0) & (full_pair >= 0),
+        is_flush,
+        straight >= 0,
+        trips > 0,
+        _POPCOUNT[pairs] >= 2,
+        pairs > 0,
+    ]
+    scores = [
+        np.full_like(rank_mask, 9 << 20),
+        (8 << 20) | (flush_straight << 16),
+        (7 << 20) | (four << 16) | _pack_top(rank_mask & ~(1 << four), 1, 12),
+        (6 << 20) | (three << 16) | (np.maximum(full_pair, 0) << 12),
+        (5 << 20) | _pack_top(flush_mask, 5, 16),
+        (4 << 20) | (straight << 16),
+        (3 << 20) | (three << 16) | _pack_top(rank_mask & ~(1 << three), 2, 12),
+        ((2 << 20) | (pair << 16) | (second_pair << 12)
+         | _pack_top(rank_mask & ~((1 << pair) | (1 << second_pair)), 1, 8)),
+        (1 << 20) | (pair << 16) | _pack_top(rank_mask & ~(1 << pair), 3, 12),
+    ]
+    return np.select(conditions, scores, default=_pack_top(rank_mask, 5, 16))
+
+def compare_hands_batch(hole_ids, board_ids):
+    """
+    Score (N, 2) hole card ids against a shared board of card ids.
+    Returns the (N,) packed scores and a boolean mask of the winning hands
+    (more than one hand is marked on a tie).
+    """
+    hole_ids = np.asarray(hole_ids, dtype=np.int64)
+    board_ids = np.asarray(board_ids, dtype=np.int64)
+    board = np.broadcast_to(board_ids, (len(hole_ids), len(board_ids)))
+    scores = evaluate_batch(np.concatenate([hole_ids, board], axis=1))
+    return scores, scores == scores.max()
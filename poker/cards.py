@@ -1,56 +1,99 @@
-import random
+from array import array
+from functools import lru_cache
+
+import numpy as np
+
+from .eval_tables import PRIMES, lookup_score
+
+# The Numba backend also scores a whole showdown in one call; the others are called once per player
+_score_showdown_compiled = None
+try:
+    from ._eval import evaluate_ids as _evaluate_compiled
+except ImportError:  # compiled evaluator not built, try the Numba one
+    try:
+        from ._eval_numba import evaluate_ids as _evaluate_compiled, score_showdown as _score_showdown_compiled
+    except ImportError:  # Numba not installed, use the Python evaluator
+        _evaluate_compiled = None
 
 class Card:
     """Represents a standard playing card"""
     RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
     SUITS = ['h', 'd', 'c', 's']  # hearts, diamonds, clubs, spades
     
+    # Rank value and suit index of each symbol, instead of list.index() per card
+    _RANK_VALUES = dict(zip(RANKS, range(len(RANKS))))
+    _SUIT_INDEXES = dict(zip(SUITS, range(len(SUITS))))
+    
+    # Cards are small fixed value objects, so skip the per-instance __dict__
+    __slots__ = ('rank', 'suit', 'rank_value', 'suit_idx', 'id', '_label')
+    
     def __init__(self, rank, suit):
-        if rank not in self.RANKS:
+        if rank not in self._RANK_VALUES:
             raise ValueError(f"Invalid rank: {rank}")
-        if suit not in self.SUITS:
+        if suit not in self._SUIT_INDEXES:
             raise ValueError(f"Invalid suit: {suit}")
             
         self.rank = rank
         self.suit = suit
-        self.rank_value = self.RANKS.index(rank)
+        self.rank_value = self._RANK_VALUES[rank]
+        self.suit_idx = self._SUIT_INDEXES[suit]
+        # Unique integer 0-51 (suit major), decoded as rank = id % 13, suit = id // 13
+        self.id = self.suit_idx * 13 + self.rank_value
+        self._label = f"{rank}{suit}"  # Built once, cards are printed in logs and the UI
         
     def __str__(self):
-        return f"{self.rank}{self.suit}"
+        return self._label
     
     def __repr__(self):
-        return self.__str__()
+        return self._label
+
+# All 52 cards in id order, built once and shared by every Deck.
+# Cards are never modified after creation, so decks can hold the same objects.
+_MASTER_DECK = tuple(Card(rank, suit) for suit in Card.SUITS for rank in Card.RANKS)
+
+# Rank value and suit index of each card id, for decoding ids without Card objects
+_RANK_OF = array('b', [card_id % 13 for card_id in range(52)])
+_SUIT_OF = array('b', [card_id // 13 for card_id in range(52)])
+# Rank prime of each card id, for the lookup tables' rank product
+_PRIME_OF = array('b', [PRIMES[card_id % 13] for card_id in range(52)])
 
 class Deck:
     """Represents a standard deck of 52 playing cards"""
     
-    def __init__(self):
+    def __init__(self, rng=None):
         self.cards = []
+        self._top = 0  # Cards below this index have not been dealt yet
+        # Shuffles draw from this generator (pass a seeded one for reproducible deals)
+        self._rng = rng if rng is not None else np.random.default_rng()
         self.reset()
         
     def reset(self):
         """Reset the deck with all 52 cards"""
-        self.cards = [Card(rank, suit) 
-                     for suit in Card.SUITS 
-                     for rank in Card.RANKS]
+        self.cards = list(_MASTER_DECK)
+        self._top = len(self.cards)
         
     def shuffle(self):
-        """Shuffle the deck"""
-        random.shuffle(self.cards)
+        """Shuffle the cards that have not been dealt yet"""
+        if self._top == len(self.cards):
+            self._rng.shuffle(self.cards)
+        else:
+            remaining = self.cards[:self._top]
+            self._rng.shuffle(remaining)
+            self.cards[:self._top] = remaining
         
     def deal(self, num_cards=1):
         """Deal a specific number of cards from the deck"""
-        if len(self.cards) < num_cards:
-            raise ValueError(f"Not enough cards in deck. {len(self.cards)} remaining.")
-            
-        dealt_cards = []
-        for _ in range(num_cards):
-            dealt_cards.append(self.cards.pop())
+        if self._top < num_cards:
+            raise ValueError(f"Not enough cards in deck. {self._top} remaining.")
             
-        return dealt_cards if num_cards > 1 else dealt_cards[0]
+        # Deal from the top of the list down by moving the cursor, leaving the list untouched
+        self._top -= num_cards
+        if num_cards == 1:
+            return self.cards[self._top]
+        return self.cards[self._top:self._top + num_cards][::-1]
     
     def __len__(self):
-        return len(self.cards)
+        return self._top
 
 class Hand:
     """Represents a poker hand"""
@@ -74,7 +117,13 @@ class Hand:
 
 def evaluate_hand(cards):
     """
-    Evaluate a poker hand and return its rank.
+    Evaluate a list of Card objects. See evaluate_ids for the return value.
+    """
+    return evaluate_ids([card.id for card in cards])
+
+def evaluate_ids(card_ids):
+    """
+    Evaluate a poker hand given as card ids (Card.id, 0-51) and return its rank.
     Returns a tuple of (hand_rank_value, [tie_breaker_values])
     where hand_rank_value is:
     9: Royal Flush
@@ -88,118 +137,250 @@ def evaluate_hand(cards):
     1: One Pair
     0: High Card
     """
-    if not cards:
+    if not card_ids:
         return (0, [0])  # Safety check - return high card with 0 value
         
-    if len(cards) < 5:
+    if len(card_ids) < 5:
         # Not enough cards, use what we have to evaluate high card
-        ranks = [card.rank_value for card in cards]
-        return (0, sorted(ranks, reverse=True)[:5])
-    
-    # Convert to simple representation for evaluation
-    ranks = [card.rank_value for card in cards]
-    suits = [card.suit for card in cards]
-    
-    # Count frequencies of each rank
-    rank_counts = {}
-    for rank in ranks:
-        if rank in rank_counts:
-            rank_counts[rank] += 1
-        else:
-            rank_counts[rank] = 1
-    
-    # Check for flush (all same suit)
-    is_flush = False
-    for suit in set(suits):
-        if suits.count(suit) >= 5:
-            is_flush = True
-            break
-    
-    # Check for straight (5 consecutive ranks)
-    sorted_ranks = sorted(set(ranks))
-    is_straight = False
-    
-    # Check normal straight
-    if len(sorted_ranks) >= 5:
-        for i in range(len(sorted_ranks) - 4):
-            if sorted_ranks[i:i+5] == list(range(sorted_ranks[i], sorted_ranks[i]+5)):
-                is_straight = True
-                straight_high = sorted_ranks[i+4]
-                break
-    
-    # Check A-5 straight (Ace counts as 1)
-    if 12 in ranks and all(r in ranks for r in [0, 1, 2, 3]):
-        is_straight = True
-        straight_high = 3  # 5 high straight
-    
-    # Determine hand rank
-    if is_straight and is_flush:
-        # Check for royal flush (10-A of same suit)
-        royal_ranks = [8, 9, 10, 11, 12]  # 10, J, Q, K, A
-        is_royal = all(r in ranks for r in royal_ranks)
+        return (0, sorted((_RANK_OF[card_id] for card_id in card_ids), reverse=True))
+    
+    return _unpack_score(score_ids(card_ids))
+
+def score_hand(cards):
+    """Packed integer score of a list of Card objects. See score_ids."""
+    return score_ids([card.id for card in cards])
+
+def score_ids(card_ids):
+    """
+    Score a poker hand given as card ids as a single integer: the hand rank
+    value in bits 20 and up, then up to five 4-bit tie-breakers from bit 16
+    down. Higher scores are better hands, so scores compare directly.
+    """
+    # The score does not depend on card order, so sort the ids into a cache key
+    return _score_ids(tuple(sorted(card_ids)))
+
+@lru_cache(maxsize=1 << 18)
+def _score_ids(card_ids):
+    """Memoized scoring of a sorted tuple of card ids, shared by every caller"""
+    if len(card_ids) < 5:
+        # Not enough cards, score the ranks as a high card hand
+        return _pack_ranks(sorted((_RANK_OF[card_id] for card_id in card_ids), reverse=True))
+    
+    if len(card_ids) <= 7:
+        if _evaluate_compiled is not None:
+            return _evaluate_compiled(card_ids)
+        # Five to seven cards: one table lookup on the rank product and suit masks
+        rank_product = 1
+        suit_masks = [0, 0, 0, 0]
+        for card_id in card_ids:
+            rank_product *= _PRIME_OF[card_id]
+            suit_masks[_SUIT_OF[card_id]] |= 1 << _RANK_OF[card_id]
+        return lookup_score(rank_product, suit_masks)
+    
+    suit_masks, rank_nibbles = _build_masks(card_ids)
+    return _score_masks(suit_masks, rank_nibbles)
+
+class BoardContext:
+    """Community cards reduced once to the masks the evaluator works on"""
+    
+    def __init__(self, board_cards):
+        self.card_ids = [card.id for card in board_cards]
+        self.suit_masks, self.rank_nibbles = _build_masks(self.card_ids)
+        # Product of the board's rank primes, the key into the lookup tables
+        self.rank_product = 1
+        for card in board_cards:
+            self.rank_product *= PRIMES[card.rank_value]
         
-        if is_royal:
-            return (9, [])  # Royal Flush
-        else:
-            return (8, [straight_high])  # Straight Flush
-            
+    def evaluate(self, hole_cards):
+        """Evaluate hole cards together with the board, same result as evaluate_hand"""
+        if len(hole_cards) + len(self.card_ids) < 5:
+            return evaluate_ids([card.id for card in hole_cards] + self.card_ids)
+        return _unpack_score(self.score(hole_cards))
+        
+    def score(self, hole_cards):
+        """Packed score of hole cards together with the board, same result as score_hand"""
+        hole_ids = [card.id for card in hole_cards]
+        card_count = len(hole_ids) + len(self.card_ids)
+        if _evaluate_compiled is not None or card_count < 5:
+            return score_ids(hole_ids + self.card_ids)
+        
+        # Merge the hole cards into a copy of the board masks
+        suit_masks = list(self.suit_masks)
+        if card_count <= 7:
+            # Five to seven cards: one table lookup on the rank product and suit masks
+            rank_product = self.rank_product
+            for card in hole_cards:
+                rank_product *= PRIMES[card.rank_value]
+                suit_masks[card.suit_idx] |= 1 << card.rank_value
+            return lookup_score(rank_product, suit_masks)
+        
+        rank_nibbles = self.rank_nibbles
+        for card_id in hole_ids:
+            rank = _RANK_OF[card_id]
+            suit_masks[_SUIT_OF[card_id]] |= 1 << rank
+            rank_nibbles += 1 << (4 * rank)
+        return _score_masks(suit_masks, rank_nibbles)
+    
+    def score_all(self, hands):
+        """Packed scores of several hands of hole cards against the board, same results as score"""
+        # The compiled kernel takes the hands as one array of two cards each, five to seven cards with the board
+        if (_score_showdown_compiled is not None and hands and 3 <= len(self.card_ids) <= 5
+                and all(len(hole_cards) == 2 for hole_cards in hands)):
+            return _score_showdown_compiled([[card.id for card in hole_cards] for hole_cards in hands], self.card_ids)
+        return [self.score(hole_cards) for hole_cards in hands]
+
+def _build_masks(card_ids):
+    """13-bit rank mask per suit (bit 0 = '2', bit 12 = 'A') and a 4-bit count per rank"""
+    suit_masks = [0, 0, 0, 0]
+    rank_nibbles = 0
+    for card_id in card_ids:
+        rank = _RANK_OF[card_id]
+        suit_masks[_SUIT_OF[card_id]] |= 1 << rank
+        rank_nibbles += 1 << (4 * rank)
+    return suit_masks, rank_nibbles
+
+def _score_masks(suit_masks, rank_nibbles):
+    """Packed score of five or more cards from their suit masks and rank counts"""
+    rank_mask = suit_masks[0] | suit_masks[1] | suit_masks[2] | suit_masks[3]
+    
+    # A flush or a straight needs five distinct ranks, so skip both tests when there are fewer
+    has_five_ranks = bin(rank_mask).count('1') >= 5
+    
+    # Check for flush (five or more cards of one suit)
+    flush_mask = 0
+    if has_five_ranks:
+        flush_mask = next((mask for mask in suit_masks if bin(mask).count('1') >= 5), 0)
+    
+    # Straight Flush / Royal Flush, using only the cards of the flush suit
+    if flush_mask:
+        straight_high = _straight_high(flush_mask)
+        if straight_high == 12:
+            return 9 << 20  # Royal Flush
+        if straight_high >= 0:
+            return (8 << 20) | (straight_high << 16)  # Straight Flush
+    
+    # No rank held twice (the common case): only flush, straight or high card are left
+    if not rank_nibbles & _NIBBLE_MULTI_BITS:
+        if flush_mask:
+            return (5 << 20) | _pack_ranks(_mask_ranks(flush_mask, 5))
+        straight_high = _straight_high(rank_mask)
+        if straight_high >= 0:
+            return (4 << 20) | (straight_high << 16)
+        return _pack_ranks(_mask_ranks(rank_mask, 5))
+    
+    # Ranks held four, three and two times, as one bit per rank nibble
+    quads = (rank_nibbles >> 2) & _NIBBLE_LOW_BITS
+    trips = (rank_nibbles >> 1) & rank_nibbles & _NIBBLE_LOW_BITS
+    pairs = (rank_nibbles >> 1) & ~rank_nibbles & _NIBBLE_LOW_BITS
+    
     # Four of a Kind
-    if 4 in rank_counts.values():
-        four_rank = [r for r, c in rank_counts.items() if c == 4][0]
-        kickers = [r for r in ranks if r != four_rank]
-        kicker = max(kickers)
-        return (7, [four_rank, kicker])
-    
-    # Full House
-    if 3 in rank_counts.values() and 2 in rank_counts.values():
-        three_rank = [r for r, c in rank_counts.items() if c == 3][0]
-        pair_rank = [r for r, c in rank_counts.items() if c == 2][0]
-        return (6, [three_rank, pair_rank])
+    if quads:
+        four_rank = _nibble_ranks(quads)[0]
+        kicker = (rank_mask & ~(1 << four_rank)).bit_length() - 1
+        return (7 << 20) | _pack_ranks([four_rank, kicker])
+    
+    # Full House - a second set of trips can play as the pair
+    trip_ranks = _nibble_ranks(trips)
+    pair_ranks = _nibble_ranks(pairs)
+    if trip_ranks and (len(trip_ranks) > 1 or pair_ranks):
+        return (6 << 20) | _pack_ranks([trip_ranks[0], max(trip_ranks[1:] + pair_ranks)])
     
     # Flush
-    if is_flush:
-        return (5, sorted(ranks, reverse=True)[:5])
+    if flush_mask:
+        return (5 << 20) | _pack_ranks(_mask_ranks(flush_mask, 5))
     
     # Straight
-    if is_straight:
-        return (4, [straight_high])
+    straight_high = _straight_high(rank_mask) if has_five_ranks else -1
+    if straight_high >= 0:
+        return (4 << 20) | (straight_high << 16)
+    
+    # Kickers come from the rank mask: below a full house the remaining
+    # ranks are all distinct, apart from a third pair which still only plays once
     
     # Three of a Kind
-    if 3 in rank_counts.values():
-        three_rank = [r for r, c in rank_counts.items() if c == 3][0]
-        kickers = sorted([r for r in ranks if r != three_rank], reverse=True)
-        return (3, [three_rank] + kickers[:2])
+    if trip_ranks:
+        three_rank = trip_ranks[0]
+        kickers = _mask_ranks(rank_mask & ~(1 << three_rank), 2)
+        return (3 << 20) | _pack_ranks([three_rank] + kickers)
     
     # Two Pair
-    pairs = [r for r, c in rank_counts.items() if c == 2]
-    if len(pairs) >= 2:
-        pairs.sort(reverse=True)
-        kickers = [r for r in ranks if r not in pairs]
-        return (2, pairs[:2] + [max(kickers)])
+    if len(pair_ranks) >= 2:
+        top_pairs = pair_ranks[:2]
+        kickers = _mask_ranks(rank_mask & ~(1 << top_pairs[0]) & ~(1 << top_pairs[1]), 1)
+        return (2 << 20) | _pack_ranks(top_pairs + kickers)
     
     # One Pair
-    if 2 in rank_counts.values():
-        pair_rank = [r for r, c in rank_counts.items() if c == 2][0]
-        kickers = sorted([r for r in ranks if r != pair_rank], reverse=True)
-        return (1, [pair_rank] + kickers[:3])
+    if pair_ranks:
+        pair_rank = pair_ranks[0]
+        kickers = _mask_ranks(rank_mask & ~(1 << pair_rank), 3)
+        return (1 << 20) | _pack_ranks([pair_rank] + kickers)
     
     # High Card
-    return (0, sorted(ranks, reverse=True)[:5])
+    return _pack_ranks(_mask_ranks(rank_mask, 5))
+
+def _pack_ranks(ranks):
+    """Pack up to five rank values as 4-bit tie-breakers, the first at bit 16"""
+    packed = 0
+    for shift, rank in zip((16, 12, 8, 4, 0), ranks):
+        packed |= rank << shift
+    return packed
+
+# Lowest bit of each of the 13 rank nibbles used by _score_masks
+_NIBBLE_LOW_BITS = 0x1111111111111
+
+# Bits 1 and 2 of each rank nibble, set when a rank is held two or more times
+_NIBBLE_MULTI_BITS = _NIBBLE_LOW_BITS * 6
+
+def _straight_high(rank_mask):
+    """Highest card of the best straight in a 13-bit rank mask, or -1"""
+    # Shift up one place and copy the Ace into bit 0 so A-2-3-4-5 is found too
+    mask = (rank_mask << 1) | (rank_mask >> 12)
+    runs = mask & (mask >> 1) & (mask >> 2) & (mask >> 3) & (mask >> 4)
+    return runs.bit_length() + 2 if runs else -1
+
+def _mask_ranks(rank_mask, count=13):
+    """Up to `count` rank values set in a 13-bit rank mask, highest first"""
+    # Walk down from the top set bit, so the ranks come out in order without sorting
+    ranks = []
+    while rank_mask and len(ranks) < count:
+        top = rank_mask.bit_length() - 1
+        ranks.append(top)
+        rank_mask ^= 1 << top
+    return ranks
+
+def _nibble_ranks(nibble_mask):
+    """Rank values marked in a one-bit-per-nibble mask, highest first"""
+    ranks = []
+    while nibble_mask:
+        top = nibble_mask.bit_length() - 1
+        ranks.append(top >> 2)
+        nibble_mask ^= 1 << top
+    return ranks
+
+# Number of tie-breaker values that follow each hand rank value
+_TIEBREAKER_COUNTS = (5, 4, 3, 3, 1, 5, 2, 2, 1, 0)
+
+def _unpack_score(score):
+    """Convert a packed score (rank value << 20 | 4-bit tie-breakers) to evaluate_hand's tuple"""
+    rank_value = score >> 20
+    tie_breakers = [(score >> (16 - 4 * i)) & 0xF for i in range(_TIEBREAKER_COUNTS[rank_value])]
+    return (rank_value, tie_breakers)
+
+# Name of each hand rank value, indexed by the value
+HAND_NAMES = (
+    "High Card",
+    "One Pair",
+    "Two Pair",
+    "Three of a Kind",
+    "Straight",
+    "Flush",
+    "Full House",
+    "Four of a Kind",
+    "Straight Flush",
+    "Royal Flush"
+)
 
 def rank_to_string(rank_tuple):
-    """Convert a hand rank tuple to a human-readable string"""
-    hand_names = [
-        "High Card",
-        "One Pair",
-        "Two Pair",
-        "Three of a Kind",
-        "Straight",
-        "Flush",
-        "Full House",
-        "Four of a Kind",
-        "Straight Flush",
-        "Royal Flush"
-    ]
-    
-    rank_value = rank_tuple[0]
-    return hand_names[rank_value]
\ No newline at end of file
+    """Convert a hand rank tuple or packed score to a human-readable string"""
+    rank_value = rank_tuple >> 20 if isinstance(rank_tuple, int) else rank_tuple[0]
+    return HAND_NAMES[rank_value]
@@ -0,0 +1,144 @@
+"""
+Monte Carlo equity
+==================
+
+Estimates each player's share of the pot by dealing random run-outs of the
+board and scoring every player's hand on all of them at once with
+``batch_eval.evaluate_batch``. Trials are independent, so they can also be
+split across worker processes, each drawing from its own child of one
+``np.random.SeedSequence`` so a seed reproduces the same estimate for the
+same number of workers. Pools of worker processes are kept between calls
+until ``shutdown_pools`` is called, or the interpreter exits.
+"""
+
+import atexit
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .batch_eval import evaluate_batch
+
+# Run-outs scored per call to evaluate_batch, which bounds the size of the working arrays
+_CHUNK_TRIALS = 8192
+
+# Worker pools by size, started on first use and kept so later estimates skip the process start-up
+_POOLS = {}
+
+def _rollout_shares(hole_ids, board_ids, trials, seed):
+    """Pot shares won by each player over `trials` random completions of the board"""
+    rng = np.random.default_rng(seed)
+    live = np.setdiff1d(np.arange(52), np.concatenate([hole_ids.ravel(), board_ids]))
+    missing = 5 - len(board_ids)
+    shares = np.zeros(len(hole_ids))
+
+    for start in range(0, trials, _CHUNK_TRIALS):
+        n = min(_CHUNK_TRIALS, trials - start)
+        # Draw the missing board cards without replacement: the smallest of a row of random keys
+        if missing:
+            keys = rng.random((n, len(live)))
+            drawn = live[np.argpartition(keys, missing - 1, axis=1)[:, :missing]]
+        else:
+            drawn = np.empty((n, 0), dtype=np.int64)
+        boards = np.concatenate([np.broadcast_to(board_ids, (n, len(board_ids))), drawn], axis=1)
+
+        # One row of scores per player; every best score on a run-out splits that pot
+        scores = np.stack([evaluate_batch(np.concatenate([np.broadcast_to(hole, (n, 2)), boards], axis=1))
+                           for hole in hole_ids])
+        winners = scores == scores.max(axis=0)
+        shares += (winners / winners.sum(axis=0)).sum(axis=1)
+    return shares
+
+def _hero_shares(hole_ids, board_ids, opponents, trials, seed):
+    """Pot share won by one hand over `trials` deals of random opponent hands and board completions"""
+    rng = np.random.default_rng(seed)
+    live = np.setdiff1d(np.arange(52), np.concatenate([hole_ids.ravel(), board_ids]))
+    missing = 5 - len(board_ids)
+    draw = missing + 2 * opponents
+    share = 0.0
+
+    for start in range(0, trials, _CHUNK_TRIALS):
+        n = min(_CHUNK_TRIALS, trials - start)
+        # Take the cards with the smallest random keys, in key order so which card goes where is random too
+        keys = rng.random((n, len(live)))
+        picked = np.argpartition(keys, draw - 1, axis=1)[:, :draw]
+        picked = np.take_along_axis(picked, np.take_along_axis(keys, picked, axis=1).argsort(axis=1), axis=1)
+        drawn = live[picked]
+        boards = np.concatenate([np.broadcast_to(board_ids, (n, len(board_ids))), drawn[:, :missing]], axis=1)
+
+        hero = evaluate_batch(np.concatenate([np.broadcast_to(hole_ids[0], (n, 2)), boards], axis=1))
+        rivals = np.stack([evaluate_batch(np.concatenate([drawn[:, missing + 2 * i:missing + 2 * i + 2], boards], axis=1))
+                           for i in range(opponents)])
+        best_rival = rivals.max(axis=0)
+        # A win takes the pot, a tie splits it with every opponent holding the same score
+        tied = (rivals == hero).sum(axis=0) + 1
+        share += np.where(hero > best_rival, 1.0, np.where(hero == best_rival, 1.0 / tied, 0.0)).sum()
+    return share
+
+def _check_cards(hole_ids, board_ids):
+    """Card id arrays of the hole cards (P, 2) and board (0-5), validated"""
+    hole_ids = np.asarray(hole_ids, dtype=np.int64)
+    board_ids = np.asarray(board_ids, dtype=np.int64).reshape(-1)
+    if hole_ids.ndim != 2 or hole_ids.shape[1] != 2:
+        raise ValueError(f"Expected a (P, 2) array of hole card ids, got shape {hole_ids.shape}")
+    if len(board_ids) > 5:
+        raise ValueError(f"A board has at most 5 cards, got {len(board_ids)}")
+    used = np.concatenate([hole_ids.ravel(), board_ids])
+    if used.min(initial=0) < 0 or used.max(initial=0) > 51 or len(np.unique(used)) != len(used):
+        raise ValueError("Card ids must be distinct and between 0 and 51")
+    return hole_ids, board_ids
+
+def _check_trials(trials):
+    """Reject trial counts that would leave nothing to average over"""
+    if trials < 1:
+        raise ValueError(f"Expected at least 1 trial, got {trials}")
+
+def _get_pool(workers):
+    """Process pool with `workers` workers, shared by every estimate that asks for that many"""
+    pool = _POOLS.get(workers)
+    if pool is None:
+        pool = _POOLS[workers] = ProcessPoolExecutor(max_workers=workers)
+    return pool
+
+def shutdown_pools():
+    """Shut down every kept worker pool; later estimates start new ones as needed"""
+    while _POOLS:
+        _, pool = _POOLS.popitem()
+        pool.shutdown(wait=True, cancel_futures=True)
+
+# Stop the workers before the interpreter tears down, so exit never waits on idle pools
+atexit.register(shutdown_pools)
+
+def _run_trials(rollout, args, trials, seed, workers):
+    """Total of `rollout(*args, trials, seed)`, with the trials shared out over `workers` processes"""
+    if workers <= 1:
+        return rollout(*args, trials, seed)
+
+    # Independent streams per worker (a Generator seeds them with one draw), and the trials split evenly
+    if isinstance(seed, np.random.Generator):
+        seed = int(seed.integers(1 << 63))
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    counts = [trials // workers + (i < trials % workers) for i in range(workers)]
+    return sum(_get_pool(workers).map(rollout, *[[arg] * workers for arg in args], counts, seeds))
+
+def estimate_equity(hole_ids, board_ids=(), trials=10000, seed=None, workers=1):
+    """
+    Monte Carlo equity of (P, 2) hole card ids (Card.id, 0-51) against each
+    other given 0-5 board card ids. Returns a (P,) array of each player's
+    expected share of the pot, with ties split evenly. With workers > 1 the
+    trials are shared out over that many processes.
+    """
+    hole_ids, board_ids = _check_cards(hole_ids, board_ids)
+    _check_trials(trials)
+    return _run_trials(_rollout_shares, (hole_ids, board_ids), trials, seed, workers) / trials
+
+def estimate_hand_equity(hole_ids, board_ids=(), opponents=1, trials=1000, seed=None, workers=1):
+    """
+    Monte Carlo equity of two hole card ids against `opponents` random hands,
+    given 0-5 board card ids: the expected share of the pot, ties split
+    evenly. The seed may also be a numpy Generator to draw from.
+    """
+    hole_ids, board_ids = _check_cards([hole_ids], board_ids)
+    if opponents < 1 or 2 * opponents + 7 > 52:
+        raise ValueError(f"Expected 1 to 22 opponents, got {opponents}")
+    _check_trials(trials)
+    return _run_trials(_hero_shares, (hole_ids, board_ids, opponents), trials, seed, workers) / trials
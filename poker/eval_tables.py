@@ -0,0 +1,66 @@
+"""
+Cactus-Kev lookup tables
+========================
+
+Lookup tables that score five to seven cards without going through the
+evaluator's branches, in the style of the Cactus-Kev evaluator. Each rank has
+a prime; the product of the primes of a hand is unique to its multiset of
+ranks, so every hand ignoring suits is one dict lookup, and a flush is one
+list lookup on the 13-bit rank mask of its suit. The better of the two is
+the score of the hand.
+
+Tables hold the same packed scores as ``cards.score_ids`` (higher is better)
+and are built from the Python evaluator the first time they are needed.
+"""
+
+from itertools import combinations_with_replacement
+
+# Prime for each rank value, '2' to 'A'
+PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+# Prime product of a multiset of 5-7 ranks -> score of those ranks, ignoring suits
+_RANK_SCORES = {}
+
+# 13-bit rank mask of one suit -> flush or straight flush score, 0 with fewer than five cards
+_FLUSH_SCORES = []
+
+def _build_tables():
+    """Fill the flush and rank tables by scoring every possible key once"""
+    # Imported here because cards imports this module for its tables
+    from .cards import _score_masks
+
+    flush_scores = [0] * (1 << 13)
+    for mask in range(1 << 13):
+        if bin(mask).count('1') >= 5:
+            nibbles = sum(1 << (4 * rank) for rank in range(13) if mask >> rank & 1)
+            flush_scores[mask] = _score_masks([mask, 0, 0, 0], nibbles)
+
+    rank_scores = {}
+    for count in (5, 6, 7):
+        for ranks in combinations_with_replacement(range(13), count):
+            if any(ranks.count(rank) > 4 for rank in set(ranks)):
+                continue
+            # Deal the cards round the four suits so no suit can hold a flush
+            suit_masks = [0, 0, 0, 0]
+            nibbles = 0
+            product = 1
+            for i, rank in enumerate(ranks):
+                suit_masks[i % 4] |= 1 << rank
+                nibbles += 1 << (4 * rank)
+                product *= PRIMES[rank]
+            rank_scores[product] = _score_masks(suit_masks, nibbles)
+
+    _FLUSH_SCORES[:] = flush_scores
+    _RANK_SCORES.update(rank_scores)
+
+def lookup_score(rank_product, suit_masks):
+    """
+    Score of 5-7 cards from the product of their rank primes and the
+    13-bit rank mask of each suit.
+    """
+    if not _RANK_SCORES:
+        _build_tables()
+    flush = _FLUSH_SCORES
+    best_flush = max(flush[suit_masks[0]], flush[suit_masks[1]],
+                     flush[suit_masks[2]], flush[suit_masks[3]])
+    return max(best_flush, _RANK_SCORES[rank_product])
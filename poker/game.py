@@ -1,15 +1,15 @@
-import random
-import time
 import logging
-from typing import List, Optional, Dict, Tuple, Any
-from enum import Enum, auto
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
 
-from .cards import Deck, evaluate_hand, rank_to_string
-from .player import Player
+import numpy as np
+
+from .cards import Deck, BoardContext, rank_to_string
 from .ai import AIPlayer
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+# Game events are logged here; the application decides whether and where they are shown
+logger = logging.getLogger(__name__)
 
 class GameState:
     """Represents the current state of a poker game"""
@@ -27,14 +27,39 @@ class GameAction:
     RAISE = "raise"
     ALL_IN = "all_in"
 
+# State that follows each betting round, the cards it deals and its name in the log (none after the river)
+_NEXT_STREET = {
+    GameState.PRE_FLOP: (GameState.FLOP, 3, "flop"),
+    GameState.FLOP: (GameState.TURN, 1, "turn"),
+    GameState.TURN: (GameState.RIVER, 1, "river"),
+    GameState.RIVER: (GameState.SHOWDOWN, 0, None),
+}
+
+def _next_set_bit(mask, seat):
+    """Lowest set bit of mask above seat, wrapping round to the lowest set bit; -1 for an empty mask"""
+    higher = mask >> (seat + 1) << (seat + 1)
+    mask = higher or mask
+    return (mask & -mask).bit_length() - 1
+
 class PokerGame:
     """Represents a Texas Hold'em poker game"""
     
-    def __init__(self, players):
+    # Game state is read and written on every action, so keep it in slots rather than a per-instance __dict__;
+    # auto_showdown and hand_complete are only set once reached, and stay unset (hasattr is False) until then
+    __slots__ = ('players', 'human_player', 'rng', 'deck', 'community_cards', '_community_view', 'pot',
+                 'current_state', 'current_player_index', 'current_player', 'current_bet', 'minimum_raise',
+                 'small_blind', 'big_blind', 'dealer_index', 'active_players', 'winning_hand_name',
+                 'auto_showdown', 'hand_complete', '_seat_of', '_in_hand_mask', '_mask_seats', '_seat_bets',
+                 '_seat_all_in', '_live_mask', '_seat_open', '_live_count', '_open_count', '_ai_state', '_is_ai', '_hand_scores')
+    
+    def __init__(self, players, rng=None):
         self.players = players
         self.human_player = next((p for p in players if p.name == "You"), None)
-        self.deck = Deck()
+        # One generator for all of the game's own randomness (pass a seeded one to replay the same deals)
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.deck = Deck(self.rng)
         self.community_cards = []
+        self._community_view = ()  # Read-only copy of community_cards handed out by get_game_state
         self.pot = 0
         self.current_state = None
         self.current_player_index = 0
@@ -46,6 +71,72 @@ class PokerGame:
         self.dealer_index = 0
         self.active_players = []
         self.winning_hand_name = ""
+        # Seat of each player
+        self._seat_of = {player: seat for seat, player in enumerate(players)}
+        # Bit i is set while seat i is still in the hand (has not folded)
+        self._in_hand_mask = (1 << len(players)) - 1
+        # Seats set in each in-hand mask seen so far; the seat count is fixed, so entries never go stale
+        self._mask_seats = {}
+        # Per-seat copies of the betting state read by is_round_complete, kept in step by _sync_seat
+        self._seat_bets = array('i', [0] * len(players))
+        self._seat_all_in = array('b', [0] * len(players))
+        # Seats still to act on the current bet: in the hand and not all-in (live, one bit per seat),
+        # and live with an unmatched bet (open)
+        self._live_mask = 0
+        self._seat_open = array('b', [0] * len(players))
+        self._live_count = 0
+        self._open_count = 0
+        # Game state handed to AI players, reused across decisions and refreshed by _ai_game_state
+        self._ai_state = {}
+        # Whether the player in each seat decides its own actions
+        self._is_ai = tuple(isinstance(player, AIPlayer) for player in players)
+        # Packed hand score of each player scored by the last determine_winners, for awarding side pots
+        self._hand_scores = {}
+    
+    def _sync_seat(self, player):
+        """Copy a player's bet and all-in flag into the per-seat arrays"""
+        seat = self._seat_of[player]
+        self._seat_bets[seat] = player.current_bet
+        self._seat_all_in[seat] = player.is_all_in
+        
+        # Adjust the live and open counts by the change in this seat alone
+        live = bool(self._in_hand_mask >> seat & 1) and not player.is_all_in
+        is_open = live and player.current_bet != self.current_bet
+        self._live_count += live - (self._live_mask >> seat & 1)
+        self._open_count += is_open - self._seat_open[seat]
+        if live:
+            self._live_mask |= 1 << seat
+        else:
+            self._live_mask &= ~(1 << seat)
+        self._seat_open[seat] = is_open
+    
+    def _recount_seats(self):
+        """Rebuild the live and open flags of every seat, after the bet to match has changed"""
+        bets, all_in, current_bet = self._seat_bets, self._seat_all_in, self.current_bet
+        live_mask = live_count = open_count = 0
+        for seat in range(len(self.players)):
+            live = bool(self._in_hand_mask >> seat & 1) and not all_in[seat]
+            is_open = live and bets[seat] != current_bet
+            live_mask |= live << seat
+            self._seat_open[seat] = is_open
+            live_count += live
+            open_count += is_open
+        self._live_mask = live_mask
+        self._live_count = live_count
+        self._open_count = open_count
+    
+    def _seats_in_hand(self):
+        """Seats still in the hand in seat order, looked up by the current in-hand mask"""
+        mask = self._in_hand_mask
+        seats = self._mask_seats.get(mask)
+        if seats is None:
+            seats = tuple(seat for seat in range(len(self.players)) if mask >> seat & 1)
+            self._mask_seats[mask] = seats
+        return seats
+    
+    def _in_hand(self, player):
+        """Whether the player has not folded this hand, in O(1)"""
+        return self._in_hand_mask >> self._seat_of[player] & 1
     
     def start_game(self):
         """Start a new poker game"""
@@ -54,21 +145,32 @@ class PokerGame:
     def start_new_hand(self):
         """Start a new hand"""
         # Reset game state
-        self.deck = Deck()
+        self.deck.reset()
         self.deck.shuffle()
         self.community_cards = []
+        self._community_view = ()
         self.pot = 0
         self.current_bet = 0
         
         # Reset player state
-        for player in self.players:
+        # A player with no chips left sits the hand out rather than holding a seat they cannot bet from
+        in_hand_mask = 0
+        for seat, player in enumerate(self.players):
             player.reset_for_hand()
+            if player.chips > 0:
+                in_hand_mask |= 1 << seat
+            else:
+                player.fold()
+        self._in_hand_mask = in_hand_mask
         
         # Set dealer position (rotate)
         self.dealer_index = (self.dealer_index + 1) % len(self.players)
         
         # Post blinds
         self.post_blinds()
+        for player in self.players:
+            self._sync_seat(player)
+        self._recount_seats()
         
         # Deal hole cards
         self.deal_hole_cards()
@@ -106,10 +208,11 @@ class PokerGame:
     
     def deal_hole_cards(self):
         """Deal two hole cards to each player"""
-        for _ in range(2):  # Two cards per player
-            for player in self.players:
-                card = self.deck.deal()
-                player.add_cards([card])
+        # Take both rounds of the deal in one slice; player i gets cards i and i + N, as if dealt one at a time
+        count = len(self.players)
+        dealt = self.deck.deal(2 * count)
+        for i, player in enumerate(self.players):
+            player.add_cards([dealt[i], dealt[count + i]])
     
     def deal_community_cards(self, count=1):
         """Deal community cards"""
@@ -117,6 +220,8 @@ class PokerGame:
         if not isinstance(new_cards, list):
             new_cards = [new_cards]
         self.community_cards.extend(new_cards)
+        # The board only changes here, so rebuild the shared view once per deal
+        self._community_view = tuple(self.community_cards)
     
     def get_community_cards(self):
         """Get the current community cards"""
@@ -130,40 +235,54 @@ class PokerGame:
             "current_bet": self.current_bet,
             "dealer_position": self.dealer_index,
             "active_players": len(self.active_players),
-            "community_cards": self.community_cards,
+            "community_cards": self._community_view,
             "player_cards": self.human_player.hand if self.human_player else [],
             "min_raise": self.minimum_raise,  # Added for UI to know minimum raise
             "hand_complete": self.is_hand_complete()  # Added to help UI know when hand is done
         }
     
+    def _ai_game_state(self):
+        """Refresh and return the reused state dict with the fields AIPlayer.decide_action reads"""
+        # Skips building a new dict and the logged is_hand_complete check of get_game_state on every AI turn
+        state = self._ai_state
+        state["pot"] = self.pot
+        state["current_bet"] = self.current_bet
+        state["community_cards"] = self._community_view
+        state["min_raise"] = self.minimum_raise
+        state["active_players"] = len(self.active_players)
+        return state
+    
     def process_action(self, player, action, amount=0):
         """Process a player action"""
-        logging.info(f"Player {player.name} performing action {action} with amount {amount}")
+        logger.info("Player %s performing action %s with amount %s", player.name, action, amount)
         if player != self.current_player:
-            logging.warning(f"It is not {player.name}'s turn.")
+            logger.warning("It is not %s's turn.", player.name)
             return False
+        bet_to_match = self.current_bet
         
         # Process based on action type    
         if action == GameAction.FOLD:
+            if not player.folded:
+                self._in_hand_mask &= ~(1 << self._seat_of[player])
             player.fold()
-            logging.info(f"Player {player.name} folded.")
+            logger.info("Player %s folded.", player.name)
         
         elif action == GameAction.CHECK:
             if self.current_bet > player.current_bet:
-                logging.warning(f"Player {player.name} cannot check.")
+                logger.warning("Player %s cannot check.", player.name)
                 return False  # Can't check if there's a bet to call
             player.check()
-            logging.info(f"Player {player.name} checked.")
+            logger.info("Player %s checked.", player.name)
         
         elif action == GameAction.CALL:
             bet_amount = player.call(self.current_bet)
             self.pot += bet_amount
-            logging.info(f"Player {player.name} called, betting {bet_amount}.")
+            logger.info("Player %s called, betting %s.", player.name, bet_amount)
         
         elif action == GameAction.RAISE:
             # Ensure minimum raise
             if amount < self.minimum_raise:
-                logging.warning(f"Raise amount {amount} is less than minimum raise {self.minimum_raise}.")
+                logger.warning("Raise amount %s is less than minimum raise %s.", amount, self.minimum_raise)
                 amount = self.minimum_raise
                 
             # Calculate actual raise amount (includes matching current bet)
@@ -174,61 +293,70 @@ class PokerGame:
             self.pot += bet_amount
             self.current_bet = player.current_bet
             self.minimum_raise = amount  # Set minimum raise for next raise
-            logging.info(f"Player {player.name} raised to {self.current_bet}.")
+            logger.info("Player %s raised to %s.", player.name, self.current_bet)
         
         elif action == GameAction.ALL_IN:
             bet_amount = player.all_in()
             self.pot += bet_amount
-            logging.info(f"Player {player.name} is all-in with {bet_amount}.")
+            logger.info("Player %s is all-in with %s.", player.name, bet_amount)
             
             # Update current bet if this all-in is higher
             if player.current_bet > self.current_bet:
+                # Since this is a raise, update minimum raise accordingly; a short all-in leaves it as it was
+                raised_by = player.current_bet - self.current_bet
                 self.current_bet = player.current_bet
-                # Since this is a raise, update minimum raise accordingly
-                self.minimum_raise = self.current_bet - player.current_bet
+                self.minimum_raise = max(self.minimum_raise, raised_by)
             
-            # Check special situations after an all-in
+            # Check special situations after an all-in, with this seat's counts brought up to date first,
+            # and every other seat measured against the new bet if the all-in raised it
+            self._sync_seat(player)
+            if self.current_bet != bet_to_match:
+                self._recount_seats()
             self._check_all_in_situations(player)
         
-        # Update active players list
-        self.update_active_players()
+        self._sync_seat(player)
+        if self.current_bet != bet_to_match:
+            # Every other seat is measured against the new bet
+            self._recount_seats()
+        
+        # Update active players list, which only changes when someone folds
+        if action == GameAction.FOLD:
+            self.update_active_players()
         
         # Check if we should move to the next player
         if len(self.active_players) > 1:
-            if player in self.active_players:
+            if self._in_hand(player):
                 # If the player is still active, move to the next player
                 self.move_to_next_player()
             else:
-                # If current player is no longer active, select the next active player
-                self.current_player = next((p for p in self.active_players if not p.is_all_in), self.active_players[0])
-        
-            # Special case: If all remaining players except one are all-in,
-            # we need to complete all betting rounds at once
-            active_not_all_in = [p for p in self.active_players if not p.is_all_in and not p.folded]
-            if len(active_not_all_in) <= 1:
-                logging.info("Only one player not all-in, completing all betting rounds")
-                while self.current_state != GameState.SHOWDOWN:
-                    # Keep dealing community cards until showdown
-                    self.next_round()
-        
-        logging.info(f"Action processed. Current pot: {self.pot}, current bet: {self.current_bet}")
+                # If current player is no longer active, select the first active player who is not all-in
+                live_mask = self._live_mask
+                if live_mask:
+                    self.current_player = self.players[(live_mask & -live_mask).bit_length() - 1]
+                else:
+                    self.current_player = self.active_players[0]
+        
+            # Special case: If all remaining players except one are all-in, and that one has
+            # matched the bet, we need to complete all betting rounds at once
+            if self._live_count <= 1 and not self._open_count:
+                logger.info("Only one player not all-in, completing all betting rounds")
+                self._run_to_showdown()
+        
+        logger.info("Action processed. Current pot: %s, current bet: %s", self.pot, self.current_bet)
         return True
     
     def _check_all_in_situations(self, all_in_player):
         """Check if the all-in action should trigger automatic progression"""
-        # If only one player is not all-in or folded, complete all betting rounds
-        active_not_all_in = [p for p in self.active_players if not p.is_all_in and not p.folded]
-        
-        if len(active_not_all_in) <= 1:
-            logging.info("Only one player not all-in, automatically dealing remaining cards")
+        # If only one player is not all-in or folded, and has nothing left to call, complete all betting rounds
+        if self._live_count <= 1 and not self._open_count:
+            logger.info("Only one player not all-in, automatically dealing remaining cards")
             # If we need to move through remaining betting rounds
             if self.current_state != GameState.SHOWDOWN:
                 # Create a copy of the active players for later restoration
                 original_active_players = list(self.active_players)
                 
                 # Deal any remaining community cards
-                while self.current_state != GameState.SHOWDOWN:
-                    self.next_round()
+                self._run_to_showdown()
                 
                 # Restore the active players 
                 self.active_players = original_active_players
@@ -236,26 +364,29 @@ class PokerGame:
                 # Mark this as an automatic showdown
                 self.auto_showdown = True
 
+    def _run_to_showdown(self):
+        """Deal the rest of the board at once and move to showdown, when no more betting can happen"""
+        if self.current_state == GameState.SHOWDOWN:
+            return
+        # The streets in between have no one to act, so skip their bet resets and first-to-act lookups
+        missing = 5 - len(self.community_cards)
+        if missing:
+            self.deal_community_cards(missing)
+            logger.info("Dealt the rest of the board: %s", self.community_cards[-missing:])
+            self.current_state = GameState.RIVER
+        # Stepping on from the river settles the bets and first player as a normal showdown does
+        self.next_round()
+    
     def move_to_next_player(self):
         """Move to the next active player"""
         if not self.active_players:
             return
             
-        start_idx = self.active_players.index(self.current_player)
-        current_idx = start_idx
-        
-        while True:
-            current_idx = (current_idx + 1) % len(self.active_players)
-            next_player = self.active_players[current_idx]
-            
-            # Skip players who are all-in
-            if next_player.is_all_in:
-                if current_idx == start_idx:  # We've gone full circle
-                    break
-                continue
-                
-            self.current_player = next_player
-            break
+        # Next seat round the table that is still in the hand and not all-in, other than this one
+        seat = self._seat_of[self.current_player]
+        seat = _next_set_bit(self._live_mask & ~(1 << seat), seat)
+        if seat >= 0:
+            self.current_player = self.players[seat]
     
     def is_round_complete(self):
         """Check if the current betting round is complete"""
@@ -265,71 +396,59 @@ class PokerGame:
         # 3. Or all active players are all-in
         
         if len(self.active_players) <= 1:
-            logging.info("Round complete: only one active player")
+            logger.info("Round complete: only one active player")
             return True
             
-        active_not_all_in = [p for p in self.active_players if not p.is_all_in]
-        if not active_not_all_in:
-            logging.info("Round complete: all active players are all-in")
+        # Use the running counts of live and open seats rather than scanning the players
+        if not self._live_count:
+            logger.info("Round complete: all active players are all-in")
             return True
             
         # Special case: Only one player left who isn't all-in
-        if len(active_not_all_in) == 1 and all(p.current_bet >= self.current_bet or p.is_all_in for p in self.active_players):
-            logging.info("Round complete: only one player not all-in, and all bets are matched")
-            return True
+        if self._live_count == 1:
+            seat = self._live_mask.bit_length() - 1
+            if self._seat_bets[seat] >= self.current_bet:
+                logger.info("Round complete: only one player not all-in, and all bets are matched")
+                return True
             
         # Normal case: Check if all active players have matched the current bet
-        all_matched = all(p.current_bet == self.current_bet or p.is_all_in for p in self.active_players)
+        all_matched = not self._open_count
         if all_matched:
-            logging.info("Round complete: all active players have matched the current bet or are all-in")
+            logger.info("Round complete: all active players have matched the current bet or are all-in")
         return all_matched
     
     def next_round(self):
         """Move to the next betting round"""
-        logging.info(f"Moving from {self.current_state} to next round")
-        
-        if self.current_state == GameState.PRE_FLOP:
-            self.current_state = GameState.FLOP
-            # Deal the flop (3 cards)
-            self.deal_community_cards(3)
-            logging.info("Dealt flop: " + ", ".join(str(card) for card in self.community_cards[-3:]))
-        
-        elif self.current_state == GameState.FLOP:
-            self.current_state = GameState.TURN
-            # Deal the turn (1 card)
-            self.deal_community_cards(1)
-            logging.info(f"Dealt turn: {self.community_cards[-1]}")
-        
-        elif self.current_state == GameState.TURN:
-            self.current_state = GameState.RIVER
-            # Deal the river (1 card)
-            self.deal_community_cards(1)
-            logging.info(f"Dealt river: {self.community_cards[-1]}")
-        
-        elif self.current_state == GameState.RIVER:
-            # After the river, move to showdown
-            self.current_state = GameState.SHOWDOWN
-            self.showdown()
-            logging.info("Moving to showdown")
+        logger.info("Moving from %s to next round", self.current_state)
+        
+        # Look the next state up instead of testing the current state against each one in turn
+        street = _NEXT_STREET.get(self.current_state)
+        if street is not None:
+            self.current_state, card_count, street_name = street
+            if card_count:
+                self.deal_community_cards(card_count)
+                logger.info("Dealt %s: %s", street_name, self.community_cards[-card_count:])
+            else:
+                # After the river, move to showdown
+                self.showdown()
+                logger.info("Moving to showdown")
         
         # Reset betting for the new round
         self.current_bet = 0
         for player in self.active_players:
             player.current_bet = 0
+            self._seat_bets[self._seat_of[player]] = 0
+        self._recount_seats()
         
         # Reset first player to act - start with player after dealer
         if self.active_players:
             # Find the first active player after the dealer
-            start_idx = (self.dealer_index + 1) % len(self.players)
-            for i in range(len(self.players)):
-                player_idx = (start_idx + i) % len(self.players)
-                if self.players[player_idx] in self.active_players:
-                    # Get the index in active_players list
-                    self.current_player_index = self.active_players.index(self.players[player_idx])
-                    self.current_player = self.active_players[self.current_player_index]
-                    break
+            seat = _next_set_bit(self._in_hand_mask, self.dealer_index)
+            self.current_player = self.players[seat]
+            # Its place in active_players is the number of in-hand seats before it
+            self.current_player_index = bin(self._in_hand_mask & ((1 << seat) - 1)).count('1')
             
-        logging.info(f"Current state is now: {self.current_state}")
+        logger.info("Current state is now: %s", self.current_state)
         return self.current_state
     
     def is_hand_complete(self):
@@ -338,16 +457,16 @@ class PokerGame:
         # 1. Only one active player remains, or
         # 2. We've reached showdown
         hand_complete = len(self.active_players) <= 1 or self.current_state == GameState.SHOWDOWN
-        logging.info(f"Hand complete check: {hand_complete}, active players: {len(self.active_players)}, state: {self.current_state}")
+        logger.info("Hand complete check: %s, active players: %s, state: %s", hand_complete, len(self.active_players), self.current_state)
         return hand_complete
     
     def showdown(self):
         """Handle the showdown phase"""
-        logging.info("Entering showdown phase")
+        logger.info("Entering showdown phase")
         # All remaining players reveal their cards
         for player in self.active_players:
             player.reveal_cards()
-            logging.info(f"Player {player.name} reveals: {', '.join(str(card) for card in player.hand)}")
+            logger.info("Player %s reveals: %s", player.name, player.hand)
         
         # Hand is complete, will be evaluated by determine_winner
         self.hand_complete = True
@@ -357,65 +476,78 @@ class PokerGame:
         Returns a list of winner(s) with their hand rankings. If multiple players tie for the best hand,
         they are all returned.
         """
-        logging.info("Determining winners...")
+        logger.info("Determining winners...")
+        self._hand_scores = {}
         
         # If only one player remains, they are the winner (everyone else folded)
         if len(self.active_players) == 1:
             winner = self.active_players[0]
             winner.hand_name = "Default Win (others folded)"
             self.winning_hand_name = "Default Win (others folded)"
-            logging.info(f"Single player remaining: {winner.name} wins by default")
+            logger.info("Single player remaining: %s wins by default", winner.name)
             return [winner]
         
-        # Gather non-folded players
-        active_players = [p for p in self.players if not p.folded and p.chips > 0]
+        # Gather non-folded players from the in-hand seats rather than re-testing every player;
+        # a player left without chips only plays for the pot if they put chips in this hand
+        players = self.players
+        active_players = [players[seat] for seat in self._seats_in_hand()
+                          if players[seat].chips > 0 or players[seat].total_bet > 0]
         if not active_players:
-            logging.info("No active players.")
+            logger.info("No active players.")
             return []
 
         best_score = None
         winners = []
         winning_hand_name = ""
 
+        # The board is shared, so reduce it once and merge each player's hole cards into it
+        board = BoardContext(self.community_cards)
+        # Score every hand in one call where the evaluator allows it; if a hand cannot be converted or
+        # scored, score them one by one below so the bad hand is logged and skipped on its own
+        try:
+            hand_scores = board.score_all([player.hand for player in active_players])
+        except (ValueError, TypeError):
+            logger.exception("Scoring the showdown in one call failed, scoring each hand separately")
+            hand_scores = None
+
         # Evaluate each player's 5-card hand using self.community_cards
-        for player in active_players:
+        for i, player in enumerate(active_players):
             # Make sure player's cards are revealed at showdown
             player.reveal_cards()
             
-            # Combine hole cards with community cards
-            all_cards = player.hand + self.community_cards
-            
-            # Evaluate the best 5-card hand
+            # Score the best 5-card hand as one integer, so ties and kickers compare directly
             try:
-                hand_value = evaluate_hand(all_cards)
-                hand_name = rank_to_string(hand_value)
+                hand_score = hand_scores[i] if hand_scores is not None else board.score(player.hand)
+                hand_name = rank_to_string(hand_score)
             except Exception as e:
-                logging.error(f"Error evaluating hand for {player.name}: {e}")
-                logging.error(f"Cards: {[str(c) for c in all_cards]}")
+                logger.error("Error evaluating hand for %s: %s", player.name, e)
+                logger.error("Cards: %s", player.hand + self.community_cards)
                 continue  # Skip this player if there's an error
             
-            logging.info(f"Player {player.name} hand value: {hand_value}, hand name: {hand_name}")
+            logger.info("Player %s hand score: %#x, hand name: %s", player.name, hand_score, hand_name)
             
             # Store the hand name with the player object
             player.hand_name = hand_name
+            self._hand_scores[player] = hand_score
             
             # Compare with current best hand
-            if best_score is None or hand_value > best_score:
-                best_score = hand_value
+            if best_score is None or hand_score > best_score:
+                best_score = hand_score
                 winners = [player]
                 winning_hand_name = hand_name
-            elif hand_value == best_score:
+            elif hand_score == best_score:
                 winners.append(player)
 
         if winners:
-            winner_names = ", ".join([winner.name for winner in winners])
-            logging.info(f"Winners: {winner_names} with {winning_hand_name}")
+            # Only join the names when the message will actually be written
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Winners: %s with %s", ", ".join(winner.name for winner in winners), winning_hand_name)
         else:
             # Fallback: if we couldn't determine a winner but have active players, pick the first active player
             if active_players:
                 winners = [active_players[0]]
                 winning_hand_name = "Default Win"
-                logging.info(f"No hand evaluation winners, defaulting to: {active_players[0].name}")
+                logger.info("No hand evaluation winners, defaulting to: %s", active_players[0].name)
         
         # Store the winning hand name in a class attribute
         self.winning_hand_name = winning_hand_name
@@ -426,87 +558,80 @@ class PokerGame:
         Splits the pot among all winners returned by determine_winners().
         Enhanced to handle side pots and all-in situations.
         """
-        logging.info("Finalizing hand...")
+        logger.info("Finalizing hand...")
         winners = self.determine_winners()
         if not winners:
-            logging.warning("No winners to finalize - this should not happen!")
+            logger.warning("No winners to finalize - this should not happen!")
             return
 
         # Special handling for all-in situations with side pots
         side_pots = self._calculate_side_pots()
         
         if side_pots:
-            logging.info(f"Calculating split with side pots: {side_pots}")
+            logger.info("Calculating split with side pots: %s", side_pots)
             self._distribute_side_pots(side_pots, winners)
         else:
             # Regular pot splitting for non-all-in situations
-            split_amount = self.pot // len(winners)
-            logging.info(f"Splitting pot of {self.pot} among {len(winners)} winners, each receiving {split_amount}")
+            split_amount, remainder = divmod(self.pot, len(winners))
+            logger.info("Splitting pot of %s among %s winners, each receiving %s", self.pot, len(winners), split_amount)
             
             for winner in winners:
                 winner.collect_winnings(split_amount)
-                logging.info(f"Player {winner.name} collected {split_amount} with {winner.hand_name}")
+                logger.info("Player %s collected %s with %s", winner.name, split_amount, winner.hand_name)
             
             # Handle any remainder
-            remainder = self.pot % len(winners)
             if remainder > 0:
                 winners[0].collect_winnings(remainder)
-                logging.info(f"Player {winners[0].name} collected remainder of {remainder}")
+                logger.info("Player %s collected remainder of %s", winners[0].name, remainder)
         
         # Reset the pot
         self.pot = 0
         self.hand_complete = True
-        logging.info("Hand finalized.")
+        logger.info("Hand finalized.")
 
     def _calculate_side_pots(self):
         """
         Calculate side pots for all-in situations.
         Returns a list of (pot_amount, eligible_players) tuples.
         """
-        if not any(p.is_all_in for p in self.active_players):
+        # Every player still in the hand is live (not all-in) unless someone went all-in
+        if self._live_count == len(self.active_players):
             return []  # No all-in players, no side pots
             
-        # Sort players by their stake amount
-        players_by_stake = sorted(
-            [p for p in self.active_players if not p.folded],
-            key=lambda player: player.stake
-        )
+        # Sort players by what they put in over the whole hand (active_players never holds a folded player)
+        players_by_stake = sorted(self.active_players, key=lambda player: player.total_bet)
         
         if not players_by_stake:
             return []
             
+        stakes = [p.total_bet for p in players_by_stake]
+        # Pots close at every stake still in the hand: each all-in amount, the matched top stake, and the
+        # stake of any live player left short of it, who then plays only for the pots they covered
+        levels = sorted(set(stakes))
+        
+        # Folded players' chips count towards every pot they reached too
+        contributions = sorted(p.total_bet for p in self.players)
+        # Chips put in by the players below each point of the sorted contributions
+        below = [0, *accumulate(contributions)]
+        
         side_pots = []
-        prev_stake = 0
-        
-        # Calculate each side pot
-        for i, current_player in enumerate(players_by_stake):
-            if current_player.is_all_in:
-                current_stake = current_player.stake
-                # Calculate pot size for this stake level
-                pot_size = 0
-                for player in self.active_players:
-                    contribution = min(current_stake, player.stake) - prev_stake
-                    if contribution > 0:
-                        pot_size += contribution
-                
-                # Eligible players are those who contributed to this pot
-                eligible_players = [p for p in self.active_players 
-                                   if not p.folded and p.stake >= current_stake]
-                
-                side_pots.append((pot_size, eligible_players))
-                prev_stake = current_stake
-        
-        # If there's a main pot left (players who weren't all in)
-        if prev_stake < max(p.stake for p in self.active_players if not p.folded):
-            pot_size = 0
-            for player in self.active_players:
-                contribution = max(0, player.stake - prev_stake)
-                pot_size += contribution
-                
-            eligible_players = [p for p in self.active_players 
-                               if not p.folded and p.stake > prev_stake]
+        prev_total = 0
+        for level in levels:
+            # Chips in the pot up to this level: everything from players below it, and the level from the rest
+            at = bisect_left(contributions, level)
+            level_total = below[at] + (len(contributions) - at) * level
+            pot_size = level_total - prev_total
+            prev_total = level_total
             
-            side_pots.append((pot_size, eligible_players))
+            # Eligible players are those who contributed to this pot
+            if pot_size:
+                side_pots.append((pot_size, players_by_stake[bisect_left(stakes, level):]))
+        
+        # A folded player who put in more than anyone still in the hand adds the excess to the last pot
+        excess = below[-1] - prev_total
+        if excess and side_pots:
+            pot_size, eligible_players = side_pots[-1]
+            side_pots[-1] = (pot_size + excess, eligible_players)
         
         return side_pots
 
@@ -515,44 +640,43 @@ class PokerGame:
         Distribute side pots to eligible winners.
         """
         total_distributed = 0
+        scores = self._hand_scores
         
         for pot_amount, eligible_players in side_pots:
-            # Find winners for this pot
-            pot_winners = [w for w in all_winners if w in eligible_players]
+            # Each pot goes to the best hand among the players eligible for it
+            scored = [player for player in eligible_players if player in scores]
+            if scored:
+                best_score = max(scores[player] for player in scored)
+                pot_winners = [player for player in scored if scores[player] == best_score]
+            else:
+                # No hands were scored (everyone else folded), so fall back to the hand's winners
+                eligible = set(eligible_players)
+                pot_winners = [w for w in all_winners if w in eligible]
             
             if pot_winners:
-                split_amount = pot_amount // len(pot_winners)
-                remainder = pot_amount % len(pot_winners)
+                split_amount, remainder = divmod(pot_amount, len(pot_winners))
                 
                 for winner in pot_winners:
                     winner.collect_winnings(split_amount)
-                    logging.info(f"Player {winner.name} collected {split_amount} from side pot with {winner.hand_name}")
+                    logger.info("Player %s collected %s from side pot with %s", winner.name, split_amount, winner.hand_name)
                     total_distributed += split_amount
                 
                 # Give remainder to first winner
                 if remainder > 0:
                     pot_winners[0].collect_winnings(remainder)
-                    logging.info(f"Player {pot_winners[0].name} collected remainder of {remainder}")
+                    logger.info("Player %s collected remainder of %s", pot_winners[0].name, remainder)
                     total_distributed += remainder
             else:
                 # Edge case: no eligible winners for this pot
                 # This could happen if all eligible players folded
-                logging.warning(f"No eligible winners for side pot of {pot_amount}")
+                logger.warning("No eligible winners for side pot of %s", pot_amount)
         
         if total_distributed != self.pot:
-            logging.warning(f"Distribution mismatch: {total_distributed} distributed from pot of {self.pot}")
+            logger.warning("Distribution mismatch: %s distributed from pot of %s", total_distributed, self.pot)
 
-    def can_check(self):
-        """Check if the current player can check"""
-        return self.current_player.current_bet >= self.current_bet
-    
-    def can_call(self):
-        """Check if the current player can call"""
-        return self.current_bet > self.current_player.current_bet
-    
     def update_active_players(self):
         """Update the list of active players (not folded)"""
-        self.active_players = [p for p in self.players if not p.folded]
+        self.active_players = [self.players[seat] for seat in self._seats_in_hand()]
     
     # Helper methods for action validation and state queries
     def get_call_amount(self, player):
@@ -570,46 +694,48 @@ class PokerGame:
     def can_raise(self, player):
         """Check if player can raise"""
         # Player needs enough chips to make at least minimum raise
-        call_amount = self.get_call_amount(player)
-        return player.chips >= call_amount + self.minimum_raise
+        return player.chips >= max(0, self.current_bet - player.current_bet) + self.minimum_raise
 
     def process_round(self):
         """Process the current round until completion"""
-        logging.info(f"Processing round: {self.current_state}")
-        
-        # Don't process if the hand is already complete
-        if self.is_hand_complete():
-            logging.info("Hand is already complete, not processing round")
-            return
-        
-        # Process AI actions until the round is complete or human player's turn
-        round_in_progress = True
-        while round_in_progress and len(self.active_players) > 1:
-            # If it's human player's turn, let the UI handle it
-            if self.current_player == self.human_player:
-                logging.info("Human player's turn, stopping round processing")
-                break
+        # Loop over the streets rather than recursing once per street when no human is in the hand
+        while True:
+            logger.info("Processing round: %s", self.current_state)
             
-            # AI players take their actions
-            if hasattr(self.current_player, 'decide_action'):
-                logging.info(f"AI player {self.current_player.name} is deciding action")
-                action, amount = self.current_player.decide_action(self.get_game_state())
-                self.process_action(self.current_player, action, amount)
+            # Don't process if the hand is already complete
+            if self.is_hand_complete():
+                logger.info("Hand is already complete, not processing round")
+                return
+            
+            # Process AI actions until the round is complete or human player's turn
+            round_in_progress = True
+            while round_in_progress and len(self.active_players) > 1:
+                # If it's human player's turn, let the UI handle it
+                if self.current_player == self.human_player:
+                    logger.info("Human player's turn, stopping round processing")
+                    break
                 
-                # Check if round is complete after this action
-                if self.is_round_complete():
-                    logging.info("Round is complete after AI action")
-                    round_in_progress = False
-            else:
-                # Skip players without decide_action method
-                self.move_to_next_player()
-        
-        # If round complete but hand not over, move to next round
-        if self.is_round_complete() and not self.is_hand_complete():
-            logging.info("Round is complete, moving to next round")
+                # AI players take their actions
+                if self._is_ai[self._seat_of[self.current_player]]:
+                    logger.info("AI player %s is deciding action", self.current_player.name)
+                    action, amount = self.current_player.decide_action(self._ai_game_state())
+                    self.process_action(self.current_player, action, amount)
+                    
+                    # Check if round is complete after this action
+                    if self.is_round_complete():
+                        logger.info("Round is complete after AI action")
+                        round_in_progress = False
+                else:
+                    # Skip players who are not AI players
+                    self.move_to_next_player()
+            
+            # If round complete but hand not over, move to next round
+            if not (self.is_round_complete() and not self.is_hand_complete()):
+                return
+            logger.info("Round is complete, moving to next round")
             self.next_round()
             
             # Process the new round if no human player is active
-            if not self.human_player or not self.human_player.is_active or self.human_player not in self.active_players:
-                logging.info("No active human player, continuing to process rounds")
-                self.process_round()
\ No newline at end of file
+            if self.human_player and self.human_player.is_active and self._in_hand(self.human_player):
+                return
+            logger.info("No active human player, continuing to process rounds")
\ No newline at end of file
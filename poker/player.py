@@ -1,12 +1,17 @@
 class Player:
     """Represents a poker player"""
     
+    # Player state is read on every action, so keep it in slots rather than a per-instance __dict__
+    __slots__ = ('name', 'chips', 'hand', 'is_active', 'current_bet', 'total_bet', 'is_all_in',
+                 'last_action', 'folded', 'revealed', 'hand_name')
+    
     def __init__(self, name, chips=1000):
         self.name = name
         self.chips = chips
         self.hand = []
         self.is_active = True
         self.current_bet = 0
+        self.total_bet = 0  # Chips put in over the whole hand, for side pots
         self.is_all_in = False
         self.last_action = None
         self.folded = False
@@ -28,6 +33,7 @@ class Player:
         self.hand = []
         self.is_active = True
         self.current_bet = 0
+        self.total_bet = 0
         self.is_all_in = False
         self.last_action = None
         self.folded = False
@@ -40,12 +46,16 @@ class Player:
     
     def place_bet(self, amount):
         """Place a bet of a specific amount"""
-        if amount > self.chips:
+        # Betting every remaining chip, including an exact all_in(), leaves the player all-in;
+        # a player who had no chips to begin with commits nothing, so does not become all-in
+        if amount >= self.chips:
             amount = self.chips
-            self.is_all_in = True
+            if amount > 0:
+                self.is_all_in = True
             
         self.chips -= amount
         self.current_bet += amount
+        self.total_bet += amount
         return amount
     
     def fold(self):
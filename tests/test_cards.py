@@ -0,0 +1,163 @@
+import random
+import unittest
+from collections import Counter
+from itertools import combinations
+from unittest import mock
+
+import numpy as np
+
+from poker import cards
+from poker.batch_eval import evaluate_batch
+from poker.cards import Card, score_ids
+
+try:
+    from poker import _eval_numba
+except ImportError:  # Numba not installed
+    _eval_numba = None
+
+try:
+    from poker import _eval
+except ImportError:  # compiled evaluator not built
+    _eval = None
+
+
+def ids(*labels):
+    """Card ids of cards given as labels such as 'Ah' or '10d'"""
+    return [Card(label[:-1], label[-1]).id for label in labels]
+
+
+def _pack(category, ranks):
+    score = category << 20
+    for i, rank in enumerate(ranks):
+        score |= rank << (16 - 4 * i)
+    return score
+
+
+def _score_five(card_ids):
+    """Packed score of exactly five cards, worked out directly from the rules"""
+    ranks = [card_id % 13 for card_id in card_ids]
+    is_flush = len({card_id // 13 for card_id in card_ids}) == 1
+    distinct = sorted(set(ranks), reverse=True)
+    straight_high = None
+    if len(distinct) == 5 and distinct[0] - distinct[4] == 4:
+        straight_high = distinct[0]
+    elif distinct == [12, 3, 2, 1, 0]:
+        straight_high = 3  # The wheel, A-5, is five high
+    # Ranks by how often they appear, then by rank
+    groups = sorted(Counter(ranks).items(), key=lambda item: (item[1], item[0]), reverse=True)
+    counts = [count for _, count in groups]
+    grouped = [rank for rank, _ in groups]
+
+    if straight_high is not None and is_flush:
+        return _pack(9, []) if straight_high == 12 else _pack(8, [straight_high])
+    if counts[0] == 4:
+        return _pack(7, grouped)
+    if counts[:2] == [3, 2]:
+        return _pack(6, grouped)
+    if is_flush:
+        return _pack(5, distinct)
+    if straight_high is not None:
+        return _pack(4, [straight_high])
+    if counts[0] == 3:
+        return _pack(3, grouped)
+    if counts[:2] == [2, 2]:
+        return _pack(2, grouped)
+    if counts[0] == 2:
+        return _pack(1, grouped)
+    return _pack(0, distinct)
+
+
+def reference_score(card_ids):
+    """Best score over every five-card subset"""
+    return max(_score_five(five) for five in combinations(card_ids, 5))
+
+
+# Hands that exercise the awkward corners of each evaluator, with the hand category they make
+EDGE_CASES = [
+    (ids("Ah", "2d", "3c", "4s", "5h", "9d", "Jc"), 4),  # wheel
+    (ids("Ah", "2h", "3h", "4h", "5h", "Kd", "Qc"), 8),  # steel wheel
+    (ids("10s", "Js", "Qs", "Ks", "As", "2d", "3c"), 9),  # royal flush
+    (ids("Kh", "Kd", "Kc", "7s", "7h", "7d", "2c"), 6),  # two trips
+    (ids("Ah", "Ad", "9c", "9s", "4h", "4d", "Kc"), 2),  # three pairs
+    (ids("8h", "8d", "8c", "8s", "5h", "5d", "5c"), 7),  # quads plus trips
+    (ids("2h", "5h", "7h", "9h", "Jh", "Kh"), 5),  # six-card flush
+    (ids("2h", "4h", "6h", "8h", "10h", "Qh", "Ah"), 5),  # seven-card flush
+    (ids("6h", "7h", "8h", "9h", "10h", "Jh", "Qd"), 8),  # straight flush in a six-card flush
+    (ids("9c", "10d", "Jh", "Qs", "Kc", "Ad", "2h"), 4),  # ace-high straight, not a royal
+]
+
+
+def random_hands(size, count, seed):
+    rng = random.Random(seed)
+    return [rng.sample(range(52), size) for _ in range(count)]
+
+
+class ReferenceTest(unittest.TestCase):
+    def test_edge_cases_make_expected_categories(self):
+        for card_ids, category in EDGE_CASES:
+            self.assertEqual(reference_score(card_ids) >> 20, category, card_ids)
+
+
+class ScoreIdsMixin:
+    """Checks a scorer of one hand of card ids against the reference"""
+
+    def score(self, card_ids):
+        raise NotImplementedError
+
+    def test_edge_cases(self):
+        for card_ids, _ in EDGE_CASES:
+            self.assertEqual(self.score(card_ids), reference_score(card_ids), card_ids)
+
+    def test_random_hands(self):
+        for size, seed in ((5, 1), (6, 2), (7, 3)):
+            for card_ids in random_hands(size, 2000, seed):
+                self.assertEqual(self.score(card_ids), reference_score(card_ids), card_ids)
+
+
+class LookupTableTest(ScoreIdsMixin, unittest.TestCase):
+    """score_ids without a compiled evaluator, which scores five to seven cards from the lookup tables"""
+
+    def setUp(self):
+        patcher = mock.patch.object(cards, "_evaluate_compiled", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Scores are cached across backends, so start and finish with an empty cache
+        cards._score_ids.cache_clear()
+        self.addCleanup(cards._score_ids.cache_clear)
+
+    def score(self, card_ids):
+        return score_ids(card_ids)
+
+
+@unittest.skipIf(_eval_numba is None, "Numba is not installed")
+class NumbaTest(ScoreIdsMixin, unittest.TestCase):
+    def score(self, card_ids):
+        return _eval_numba.evaluate_ids(card_ids)
+
+    def test_score_showdown(self):
+        board = ids("Qh", "Jd", "9s", "5c", "4h")
+        hands = [ids("Ah", "As"), ids("Kd", "10c"), ids("5d", "5h")]
+        self.assertEqual(_eval_numba.score_showdown(hands, board),
+                         [reference_score(hole + board) for hole in hands])
+
+
+@unittest.skipIf(_eval is None, "Compiled evaluator is not built")
+class CythonTest(ScoreIdsMixin, unittest.TestCase):
+    def score(self, card_ids):
+        return _eval.evaluate_ids(card_ids)
+
+
+class EvaluateBatchTest(unittest.TestCase):
+    def test_edge_cases(self):
+        for size in (6, 7):
+            hands = [card_ids for card_ids, _ in EDGE_CASES if len(card_ids) == size]
+            self.assertEqual(evaluate_batch(np.array(hands)).tolist(), [reference_score(hand) for hand in hands])
+
+    def test_random_hands(self):
+        for size, seed in ((5, 4), (6, 5), (7, 6)):
+            hands = random_hands(size, 2000, seed)
+            self.assertEqual(evaluate_batch(np.array(hands)).tolist(), [reference_score(hand) for hand in hands])
+
+
+if __name__ == "__main__":
+    unittest.main()
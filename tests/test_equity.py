@@ -0,0 +1,92 @@
+import unittest
+
+import numpy as np
+
+from poker import equity
+from poker.cards import Card
+from poker.equity import estimate_equity, estimate_hand_equity, shutdown_pools
+
+
+def ids(*labels):
+    """Card ids of cards given as labels such as 'Ah' or '10d'"""
+    return [Card(label[:-1], label[-1]).id for label in labels]
+
+
+ACES = ids("Ah", "As")
+KINGS = ids("Kd", "Kc")
+
+
+class EstimateEquityTest(unittest.TestCase):
+    def test_aces_against_kings(self):
+        shares = estimate_equity([ACES, KINGS], trials=20000, seed=1)
+        # Aces win about 82% of the time against kings of other suits
+        self.assertAlmostEqual(shares[0], 0.82, delta=0.02)
+        self.assertAlmostEqual(shares.sum(), 1.0)
+
+    def test_full_board_is_decided(self):
+        board = ids("2c", "7d", "9s", "Jh", "3c")
+        np.testing.assert_array_equal(estimate_equity([ACES, KINGS], board, trials=10, seed=1), [1.0, 0.0])
+
+    def test_fixed_seed_repeats(self):
+        first = estimate_equity([ACES, KINGS], trials=2000, seed=7)
+        np.testing.assert_array_equal(estimate_equity([ACES, KINGS], trials=2000, seed=7), first)
+
+    def test_zero_trials(self):
+        with self.assertRaises(ValueError):
+            estimate_equity([ACES, KINGS], trials=0)
+
+    def test_duplicate_card(self):
+        with self.assertRaises(ValueError):
+            estimate_equity([ACES, ids("Ah", "Kc")])
+        with self.assertRaises(ValueError):
+            estimate_equity([ACES, KINGS], ids("As", "2c", "3c"))
+
+    def test_out_of_range_card(self):
+        with self.assertRaises(ValueError):
+            estimate_equity([ACES, [KINGS[0], 52]])
+        with self.assertRaises(ValueError):
+            estimate_equity([ACES, KINGS], [-1])
+
+
+class EstimateHandEquityTest(unittest.TestCase):
+    def test_aces_against_a_random_hand(self):
+        # Aces win about 85% of the time against one random hand
+        self.assertAlmostEqual(estimate_hand_equity(ACES, trials=4000, seed=1), 0.85, delta=0.03)
+
+    def test_zero_trials(self):
+        with self.assertRaises(ValueError):
+            estimate_hand_equity(ACES, trials=0)
+
+    def test_duplicate_card(self):
+        with self.assertRaises(ValueError):
+            estimate_hand_equity(ACES, ids("Ah", "2c", "3c"))
+
+    def test_out_of_range_card(self):
+        with self.assertRaises(ValueError):
+            estimate_hand_equity([ACES[0], 60])
+
+
+class WorkerPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(shutdown_pools)
+
+    def test_workers_repeat_for_a_fixed_seed(self):
+        first = estimate_equity([ACES, KINGS], trials=2000, seed=3, workers=2)
+        np.testing.assert_array_equal(estimate_equity([ACES, KINGS], trials=2000, seed=3, workers=2), first)
+        self.assertAlmostEqual(first[0], 0.82, delta=0.04)
+
+        hand_share = estimate_hand_equity(ACES, trials=1000, seed=3, workers=2)
+        self.assertEqual(estimate_hand_equity(ACES, trials=1000, seed=3, workers=2), hand_share)
+
+    def test_shutdown_pools(self):
+        estimate_equity([ACES, KINGS], trials=100, seed=1, workers=2)
+        self.assertIn(2, equity._POOLS)
+        shutdown_pools()
+        self.assertEqual(equity._POOLS, {})
+        # A later estimate starts a new pool
+        estimate_equity([ACES, KINGS], trials=100, seed=1, workers=2)
+        self.assertIn(2, equity._POOLS)
+
+
+if __name__ == "__main__":
+    unittest.main()
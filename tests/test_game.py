@@ -0,0 +1,117 @@
+import unittest
+
+import numpy as np
+
+from poker.cards import Card
+from poker.game import GameAction, GameState, PokerGame
+from poker.player import Player
+
+
+def cards(*labels):
+    """Build cards from labels such as 'Ah' or '10d'"""
+    return [Card(label[:-1], label[-1]) for label in labels]
+
+
+def play_out(game, choose):
+    """Take each player's action from choose(player) until the hand reaches showdown"""
+    while not game.is_hand_complete():
+        player = game.current_player
+        game.process_action(player, choose(player))
+        if game.is_round_complete() and not game.is_hand_complete():
+            game.next_round()
+
+
+def check_or_call(game):
+    return lambda player: GameAction.CALL if game.current_bet > player.current_bet else GameAction.CHECK
+
+
+class BustedPlayerTest(unittest.TestCase):
+    def test_place_bet_without_chips_is_not_all_in(self):
+        busted = Player("Busted", 0)
+        self.assertEqual(busted.place_bet(10), 0)
+        self.assertFalse(busted.is_all_in)
+
+        short = Player("Short", 50)
+        self.assertEqual(short.place_bet(50), 50)
+        self.assertTrue(short.is_all_in)
+
+    def test_busted_player_does_not_win_showdown(self):
+        a, b, busted = Player("A", 500), Player("B", 500), Player("Busted", 0)
+        game = PokerGame([a, b, busted], rng=np.random.default_rng(0))
+        game.start_new_hand()
+        self.assertTrue(busted.folded)
+        self.assertFalse(busted.is_all_in)
+
+        play_out(game, check_or_call(game))
+        # Busted holds the best hand, but never had chips in the pot
+        busted.hand = cards("Ah", "As")
+        a.hand = cards("2c", "7d")
+        b.hand = cards("3c", "8d")
+        game.community_cards = cards("Kh", "Qd", "9s", "5c", "4h")
+
+        self.assertEqual(game.determine_winners(), [b])
+        game.finalize_hand()
+        self.assertEqual(busted.chips, 0)
+        self.assertEqual(a.chips + b.chips, 1000)
+
+
+class SidePotTest(unittest.TestCase):
+    def test_three_way_all_in_pays_each_pot_to_its_best_hand(self):
+        short, mid, big = Player("Short", 100), Player("Mid", 300), Player("Big", 300)
+        game = PokerGame([short, mid, big], rng=np.random.default_rng(0))
+        game.start_new_hand()
+
+        play_out(game, lambda player: check_or_call(game)(player) if player is big else GameAction.ALL_IN)
+        short.hand = cards("Ah", "As")
+        mid.hand = cards("Kh", "Ks")
+        big.hand = cards("2c", "7d")
+        game.community_cards = cards("Qh", "Jd", "9s", "5c", "4h")
+
+        game.finalize_hand()
+        # Short wins the 300 main pot; Mid beats Big for the 400 side pot
+        self.assertEqual((short.chips, mid.chips, big.chips), (300, 400, 0))
+
+    def test_heads_up_shove_lets_big_blind_act(self):
+        shover, big_blind = Player("Shover", 1000), Player("BB", 1000)
+        game = PokerGame([shover, big_blind], rng=np.random.default_rng(0))
+        game.start_new_hand()
+
+        self.assertIs(game.current_player, shover)
+        game.process_action(shover, GameAction.ALL_IN)
+        # The big blind still faces the shove, so the board is not run out yet
+        self.assertEqual(game.current_state, GameState.PRE_FLOP)
+        self.assertIs(game.current_player, big_blind)
+        # A live player short of the top stake only plays for the pot they covered
+        self.assertEqual([(pot, set(eligible)) for pot, eligible in game._calculate_side_pots()],
+                         [(20, {big_blind, shover}), (990, {shover})])
+
+        game.process_action(big_blind, GameAction.CALL)
+        self.assertEqual(game.current_state, GameState.SHOWDOWN)
+        big_blind.hand = cards("Ah", "As")
+        shover.hand = cards("Kh", "Ks")
+        game.community_cards = cards("Qh", "Jd", "9s", "5c", "4h")
+
+        self.assertEqual(game.determine_winners(), [big_blind])
+        game.finalize_hand()
+        self.assertEqual((big_blind.chips, shover.chips), (2000, 0))
+
+
+class MinimumRaiseTest(unittest.TestCase):
+    def test_short_all_in_keeps_minimum_raise(self):
+        big_blind, raiser, short = Player("BB", 1000), Player("Raiser", 1000), Player("Short", 75)
+        game = PokerGame([big_blind, raiser, short], rng=np.random.default_rng(0))
+        game.start_new_hand()
+
+        self.assertIs(game.current_player, raiser)
+        game.process_action(raiser, GameAction.RAISE, 40)
+        self.assertEqual(game.minimum_raise, 40)
+
+        self.assertIs(game.current_player, short)
+        game.process_action(short, GameAction.ALL_IN)
+        # The all-in only raises by 25, so the next full raise must still be at least 40
+        self.assertEqual(game.current_bet, 75)
+        self.assertEqual(game.minimum_raise, 40)
+
+
+if __name__ == "__main__":
+    unittest.main()